@@ -10,15 +10,32 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from flask import Flask
 from flask_cors import CORS
 from backend.database.db_setup import init_database
+from backend.database.backup import get_snapshot_manager
 from backend.views.locker_routes import locker_bp
 from backend.views.asset_routes import asset_bp
+from backend.views.transfer_routes import transfer_bp
+from backend.views.backup_routes import backup_bp
+from backend.views.valuation_routes import valuation_bp
+from backend.views.replica_routes import replica_bp, VERSION_HEADER
+from backend.views.attachment_routes import attachment_bp
+from backend.models.repository import get_repository
+from backend.views.admission import init_admission
+from backend.views.compression import compressor
 
 app = Flask(__name__)
-CORS(app)  # Enable CORS for React frontend
+app.config.from_prefixed_env('LOCKER')  # e.g. LOCKER_RATE_LIMIT_BURST=50 sets RATE_LIMIT_BURST
+CORS(app, expose_headers=[VERSION_HEADER], max_age=600)  # Enable CORS for React frontend (it tracks X-Locker-Version)
+init_admission(app)  # Rate limiting and concurrency limits (see RATE_LIMIT_* / CONCURRENCY_* config)
+compressor.init_app(app)  # gzip/brotli response compression (see COMPRESS_* config)
 
 # Register blueprints
 app.register_blueprint(locker_bp)
 app.register_blueprint(asset_bp)
+app.register_blueprint(transfer_bp)
+app.register_blueprint(backup_bp)
+app.register_blueprint(valuation_bp)
+app.register_blueprint(replica_bp)
+app.register_blueprint(attachment_bp)
 
 
 @app.route('/')
@@ -31,6 +48,16 @@ def index():
 if __name__ == '__main__':
     # Initialize database on startup
     init_database()
+    # Start background jobs only in the reloader's serving process
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        # Scheduled snapshots, if configured
+        snapshot_interval = float(os.environ.get('LOCKER_SNAPSHOT_INTERVAL', '0'))
+        if snapshot_interval > 0:
+            get_snapshot_manager().start(snapshot_interval)
+        # Read replica refresh, if replicas are configured
+        replicas = getattr(get_repository(), 'replicas', None)
+        if replicas:
+            replicas.start()
     # Run the Flask app
     app.run(debug=True, port=5000)
 
@@ -0,0 +1,207 @@
+"""
+Command line entry point for backend maintenance tasks.
+
+Usage:
+    python -m backend import lockers lockers.csv
+    python -m backend import assets assets.jsonl --chunk-size 1000
+    python -m backend export assets assets.jsonl --include-deleted
+    python -m backend backup locker-copy.db
+    python -m backend snapshot --every 3600 --keep 24
+    python -m backend verify locker-copy.db
+    python -m backend restore locker-copy.db
+    python -m backend replicas
+    python -m backend gc-blobs --grace 3600
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from backend.database.backup import (SnapshotManager, backup_database, get_backup_dir,
+                                     get_snapshot_keep, restore_database, verify_backup,
+                                     DEFAULT_PAGES_PER_STEP, DEFAULT_STEP_PAUSE)
+from backend.models.repository import get_repository
+from backend.storage.blob_store import DEFAULT_GC_GRACE_SECONDS
+from backend.presenters.attachment_service import AttachmentService
+from backend.presenters.transfer_service import TransferService, ENTITIES, FORMATS, DEFAULT_CHUNK_SIZE
+
+
+def _guess_format(path, fmt):
+    """Pick the file format from --format or the file extension."""
+    if fmt:
+        return fmt
+    extension = os.path.splitext(path)[1].lstrip('.').lower()
+    if extension in ('jsonl', 'ndjson', 'json'):
+        return 'jsonl'
+    return 'csv'
+
+
+def _print_progress(stats):
+    """Print import progress to stderr."""
+    print("{rows_read} rows read, {rows_inserted} inserted, {rows_failed} failed "
+          "({rows_per_second} rows/sec)".format(**stats), file=sys.stderr)
+
+
+def run_import(args):
+    """Run the import command."""
+    # Create the schema quietly: stdout carries only the JSON stats
+    get_repository().init_schema()
+    fmt = _guess_format(args.path, args.format)
+    if args.path == '-':
+        source = sys.stdin
+    else:
+        source = open(args.path, 'r', encoding='utf-8', newline='')
+    try:
+        stats = TransferService.import_records(args.entity, source, fmt,
+                                               chunk_size=args.chunk_size,
+                                               progress=_print_progress)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    print(json.dumps(stats, indent=2))
+    return 0 if stats['rows_failed'] == 0 else 1
+
+
+def run_export(args):
+    """Run the export command."""
+    fmt = _guess_format(args.path, args.format)
+    if args.path == '-':
+        target = sys.stdout
+    else:
+        target = open(args.path, 'w', encoding='utf-8', newline='')
+    try:
+        for chunk in TransferService.export_records(args.entity, fmt,
+                                                    include_deleted=args.include_deleted):
+            target.write(chunk)
+    finally:
+        if target is not sys.stdout:
+            target.close()
+    return 0
+
+
+def _print_backup_progress(remaining, total):
+    """Print backup progress to stderr."""
+    print("{} of {} pages copied".format(total - remaining, total), file=sys.stderr)
+
+
+def run_backup(args):
+    """Run the backup command."""
+    result = backup_database(args.path, pages=args.pages, pause=args.pause,
+                             progress=_print_backup_progress)
+    if args.verify:
+        ok, messages = verify_backup(args.path)
+        result['integrity_check'] = messages[:20]
+        if not ok:
+            print(json.dumps(result, indent=2))
+            return 1
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+def run_snapshot(args):
+    """Run the snapshot command, once or on a schedule."""
+    manager = SnapshotManager(args.dir or get_backup_dir(), keep=args.keep or get_snapshot_keep(),
+                              pages=args.pages, pause=args.pause)
+    while True:
+        print(json.dumps(manager.take_snapshot(), indent=2))
+        if not args.every:
+            return 0
+        time.sleep(args.every)
+
+
+def run_verify(args):
+    """Run the verify command."""
+    ok, messages = verify_backup(args.path)
+    print('\n'.join(messages))
+    return 0 if ok else 1
+
+
+def run_restore(args):
+    """Run the restore command."""
+    print(json.dumps(restore_database(args.path, verify=not args.skip_verify), indent=2))
+    return 0
+
+
+def run_replicas(args):
+    """Refresh the configured read replicas once and print their lag."""
+    replicas = getattr(get_repository(), 'replicas', None)
+    if not replicas:
+        print("No read replicas configured (set LOCKER_READ_REPLICAS)", file=sys.stderr)
+        return 1
+    replicas.refresh_all()
+    print(json.dumps(replicas.status(), indent=2))
+    return 0
+
+
+def run_gc_blobs(args):
+    """Delete attachment files that no active attachment references."""
+    print(json.dumps(AttachmentService.collect_garbage(grace_seconds=args.grace), indent=2))
+    return 0
+
+
+def build_parser():
+    """Build the argument parser for all commands."""
+    parser = argparse.ArgumentParser(prog='python -m backend',
+                                     description='Family Locker Organizer maintenance commands')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = commands.add_parser('import', help='Bulk load lockers or assets from CSV/JSONL')
+    import_parser.add_argument('entity', choices=ENTITIES)
+    import_parser.add_argument('path', help="Input file, or - for stdin")
+    import_parser.add_argument('--format', choices=FORMATS)
+    import_parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    import_parser.set_defaults(handler=run_import)
+
+    export_parser = commands.add_parser('export', help='Dump lockers or assets to CSV/JSONL')
+    export_parser.add_argument('entity', choices=ENTITIES)
+    export_parser.add_argument('path', help="Output file, or - for stdout")
+    export_parser.add_argument('--format', choices=FORMATS)
+    export_parser.add_argument('--include-deleted', action='store_true')
+    export_parser.set_defaults(handler=run_export)
+
+    backup_parser = commands.add_parser('backup', help='Copy the live database to a file')
+    backup_parser.add_argument('path')
+    backup_parser.add_argument('--pages', type=int, default=DEFAULT_PAGES_PER_STEP,
+                               help='Pages copied per step (default: all in one step)')
+    backup_parser.add_argument('--pause', type=float, default=DEFAULT_STEP_PAUSE,
+                               help='Seconds to pause between steps')
+    backup_parser.add_argument('--verify', action='store_true', help='Run an integrity check afterwards')
+    backup_parser.set_defaults(handler=run_backup)
+
+    snapshot_parser = commands.add_parser('snapshot', help='Take timestamped snapshots with retention')
+    snapshot_parser.add_argument('--dir', help='Snapshot directory (default LOCKER_BACKUP_DIR or backend/backups)')
+    snapshot_parser.add_argument('--keep', type=int, help='Number of snapshots to keep')
+    snapshot_parser.add_argument('--every', type=float, help='Repeat every N seconds')
+    snapshot_parser.add_argument('--pages', type=int, default=DEFAULT_PAGES_PER_STEP)
+    snapshot_parser.add_argument('--pause', type=float, default=DEFAULT_STEP_PAUSE)
+    snapshot_parser.set_defaults(handler=run_snapshot)
+
+    verify_parser = commands.add_parser('verify', help='Run an integrity check on a backup file')
+    verify_parser.add_argument('path')
+    verify_parser.set_defaults(handler=run_verify)
+
+    restore_parser = commands.add_parser('restore', help='Replace the live database with a backup file')
+    restore_parser.add_argument('path')
+    restore_parser.add_argument('--skip-verify', action='store_true')
+    restore_parser.set_defaults(handler=run_restore)
+
+    replicas_parser = commands.add_parser('replicas', help='Refresh read replicas and show their lag')
+    replicas_parser.set_defaults(handler=run_replicas)
+
+    gc_parser = commands.add_parser('gc-blobs', help='Delete attachment files no attachment references')
+    gc_parser.add_argument('--grace', type=float, default=DEFAULT_GC_GRACE_SECONDS,
+                           help='Keep files modified in the last N seconds (default 3600)')
+    gc_parser.set_defaults(handler=run_gc_blobs)
+
+    return parser
+
+
+def main(argv=None):
+    """Parse arguments and run the selected command."""
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,293 @@
+"""
+Online backup, snapshot and restore for the SQLite database.
+Copies are made with the SQLite backup API (see sqlite_copy.py); with the
+primary in WAL mode, request writers are not blocked while a backup runs.
+"""
+import glob
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from backend.database.db_setup import get_db_path, get_connection
+from backend.database.replicas import read_version
+from backend.database.sqlite_copy import copy_database
+from backend.models.repository import get_repository
+
+
+# Pages copied per backup step (-1: the whole database in one step) and pause
+# between steps. A stepped backup falls back to one step if writes restart it.
+DEFAULT_PAGES_PER_STEP = -1
+DEFAULT_STEP_PAUSE = 0.0
+
+SNAPSHOT_PREFIX = 'locker-'
+SNAPSHOT_SUFFIX = '.db'
+
+_backup_lock = threading.Lock()
+_metrics_lock = threading.Lock()
+_metrics = {
+    'running': False,
+    'target': None,
+    'pages_total': 0,
+    'pages_remaining': 0,
+    'started_at': None,
+    'last_backup': None,
+    'last_verification': None,
+    'backups_completed': 0,
+    'backups_failed': 0,
+}
+
+
+def _update_metrics(**values):
+    """Update backup metrics under the metrics lock."""
+    with _metrics_lock:
+        _metrics.update(values)
+
+
+def get_backup_status():
+    """
+    Get a copy of the current backup progress and throughput metrics.
+    Progress is updated after each backup step; a one-step copy (the default)
+    reports 0% while it runs and then completes.
+    """
+    with _metrics_lock:
+        status = dict(_metrics)
+    if status['running'] and status['pages_total']:
+        copied = status['pages_total'] - status['pages_remaining']
+        status['percent_complete'] = round(100.0 * copied / status['pages_total'], 1)
+    return status
+
+
+def _require_sqlite():
+    """Backups copy the SQLite file; server databases have their own backup tools."""
+    if get_repository().name != 'sqlite':
+        raise RuntimeError("Online backup is only available with the SQLite backend")
+
+
+def _connect_readonly(path):
+    """Open a database file read-only."""
+    if not os.path.exists(path):
+        raise ValueError("Backup file not found: {}".format(path))
+    return sqlite3.connect('file:{}?mode=ro'.format(path), uri=True)
+
+
+def backup_database(dest_path, pages=DEFAULT_PAGES_PER_STEP, pause=DEFAULT_STEP_PAUSE, progress=None):
+    """
+    Copy the live database to dest_path while the app keeps running.
+    The copy is written to a temporary file and renamed into place when
+    complete, so dest_path never holds a torn copy.
+    """
+    if pages == 0 or pages < -1:
+        raise ValueError("pages must be positive, or -1 to copy in one step")
+    _require_sqlite()
+    if not _backup_lock.acquire(blocking=False):
+        raise RuntimeError("A backup is already running")
+    try:
+        return _run_backup(dest_path, pages, pause, progress)
+    finally:
+        _backup_lock.release()
+
+
+def _run_backup(dest_path, pages, pause, progress):
+    """Copy the live database and record metrics (caller holds the backup lock)."""
+    def on_step(remaining, total):
+        _update_metrics(pages_total=total, pages_remaining=remaining)
+        if progress:
+            progress(remaining, total)
+
+    _update_metrics(running=True, target=dest_path, pages_total=0, pages_remaining=0,
+                    started_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    started = time.monotonic()
+    source = get_connection()
+    try:
+        pages_copied = copy_database(source, dest_path, pages=pages, pause=pause, progress=on_step)
+    except Exception:
+        with _metrics_lock:
+            _metrics['running'] = False
+            _metrics['backups_failed'] += 1
+        raise
+    finally:
+        source.close()
+
+    duration = time.monotonic() - started
+    size = os.path.getsize(dest_path)
+    result = {
+        'path': dest_path,
+        'pages': pages_copied,
+        'bytes': size,
+        'duration_seconds': round(duration, 3),
+        'bytes_per_second': round(size / duration) if duration > 0 else size,
+        'completed_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+    }
+    with _metrics_lock:
+        _metrics['running'] = False
+        _metrics['pages_remaining'] = 0
+        _metrics['last_backup'] = result
+        _metrics['backups_completed'] += 1
+    return result
+
+
+def verify_backup(path):
+    """Run PRAGMA integrity_check on a backup file. Returns (ok, messages)."""
+    conn = _connect_readonly(path)
+    try:
+        messages = [row[0] for row in conn.execute('PRAGMA integrity_check').fetchall()]
+    except sqlite3.DatabaseError as e:
+        # Not a database at all (e.g. truncated or overwritten)
+        messages = [str(e)]
+    finally:
+        conn.close()
+    ok = messages == ['ok']
+    _update_metrics(last_verification={
+        'path': path,
+        'ok': ok,
+        'messages': messages[:20],
+        'checked_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+    })
+    return ok, messages
+
+
+def restore_database(source_path, verify=True):
+    """
+    Replace the contents of the live database with a backup file.
+    The whole backup is copied in a single step so readers never see a mix
+    of old and new pages. The restored database is migrated to the current
+    schema and given a replication version above any the replicas have seen,
+    so they all count as lagging until refreshed.
+    """
+    _require_sqlite()
+    if verify:
+        ok, messages = verify_backup(source_path)
+        if not ok:
+            raise ValueError("Backup failed integrity check: {}".format('; '.join(messages[:5])))
+    started = time.monotonic()
+    source = _connect_readonly(source_path)
+    target = get_connection()
+    try:
+        previous_version = read_version(target)
+        source.backup(target, pages=-1)
+        # The backup file is in rollback-journal mode; keep the live database in WAL
+        target.execute('PRAGMA journal_mode=WAL')
+    finally:
+        target.close()
+        source.close()
+    get_repository().init_schema()
+    target = get_connection()
+    try:
+        version = max(previous_version, read_version(target)) + 1
+        target.execute('UPDATE ReplicationState SET version = ? WHERE id = 1', (version,))
+        target.commit()
+    finally:
+        target.close()
+    return {
+        'path': source_path,
+        'restored_to': get_db_path(),
+        'duration_seconds': round(time.monotonic() - started, 3),
+    }
+
+
+class SnapshotManager:
+    """Takes timestamped snapshots into a directory and keeps the newest few."""
+
+    def __init__(self, directory, keep=7, verify=True, pages=DEFAULT_PAGES_PER_STEP,
+                 pause=DEFAULT_STEP_PAUSE):
+        if keep < 1:
+            raise ValueError("keep must be at least 1")
+        self.directory = directory
+        self.keep = keep
+        self.verify = verify
+        self.pages = pages
+        self.pause = pause
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        # Integrity checks read the whole snapshot, so they run on their own thread
+        self._verifier = ThreadPoolExecutor(max_workers=1)
+
+    def list_snapshots(self):
+        """List snapshot files, newest first."""
+        pattern = os.path.join(self.directory, SNAPSHOT_PREFIX + '*' + SNAPSHOT_SUFFIX)
+        return sorted(glob.glob(pattern), reverse=True)
+
+    def take_snapshot(self):
+        """Take one snapshot, queue its verification and prune old snapshots."""
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("A snapshot is already running")
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Microseconds keep names unique and in order when snapshots are taken back to back
+            name = SNAPSHOT_PREFIX + datetime.now().strftime('%Y%m%d-%H%M%S-%f') + SNAPSHOT_SUFFIX
+            path = os.path.join(self.directory, name)
+            result = backup_database(path, pages=self.pages, pause=self.pause)
+            if self.verify:
+                self._verifier.submit(verify_backup, path)
+            self.prune()
+            return result
+        finally:
+            self._lock.release()
+
+    def prune(self):
+        """Delete all but the newest `keep` snapshots."""
+        removed = []
+        for path in self.list_snapshots()[self.keep:]:
+            os.remove(path)
+            removed.append(path)
+        return removed
+
+    def start(self, interval):
+        """Take a snapshot every `interval` seconds on a background thread."""
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.take_snapshot()
+                except Exception as e:
+                    print("Scheduled snapshot failed: {}".format(e))
+
+        self._thread = threading.Thread(target=run, name='snapshot-scheduler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the snapshot scheduler."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def status(self):
+        """Get snapshot list plus backup progress and throughput metrics."""
+        status = get_backup_status()
+        status['directory'] = self.directory
+        status['keep'] = self.keep
+        status['scheduled'] = bool(self._thread and self._thread.is_alive())
+        status['snapshots'] = [os.path.basename(path) for path in self.list_snapshots()]
+        return status
+
+
+_snapshot_manager = None
+
+
+def get_backup_dir():
+    """Get the snapshot directory (LOCKER_BACKUP_DIR, or backend/backups)."""
+    default = os.path.normpath(os.path.join(os.path.dirname(get_db_path()), 'backups'))
+    return os.environ.get('LOCKER_BACKUP_DIR') or default
+
+
+def get_snapshot_keep():
+    """Get the number of snapshots to keep (LOCKER_SNAPSHOT_KEEP, default 7)."""
+    return int(os.environ.get('LOCKER_SNAPSHOT_KEEP', '7'))
+
+
+def get_snapshot_manager():
+    """Get the app-wide snapshot manager, configured from the environment."""
+    global _snapshot_manager
+    if _snapshot_manager is None:
+        _snapshot_manager = SnapshotManager(get_backup_dir(), keep=get_snapshot_keep())
+    return _snapshot_manager
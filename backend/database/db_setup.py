@@ -8,7 +8,10 @@ from datetime import datetime
 
 
 def get_db_path():
-    """Get the path to the SQLite database file."""
+    """Get the path to the SQLite database file (LOCKER_DATABASE_URL=sqlite:///path overrides it)."""
+    url = os.environ.get('LOCKER_DATABASE_URL', '')
+    if url.startswith('sqlite:///'):
+        return url[len('sqlite:///'):]
     db_dir = os.path.join(os.path.dirname(__file__), '..')
     return os.path.join(db_dir, 'locker.db')
 
@@ -22,10 +25,20 @@ def get_connection():
 
 
 def init_database():
-    """Initialize the database and create all tables if they don't exist."""
-    conn = get_connection()
+    """Initialize the configured database and create all tables if they don't exist."""
+    from backend.models.repository import get_repository
+    get_repository().init_schema()
+    print("Database initialized successfully!")
+
+
+def create_sqlite_schema(db_path=None):
+    """Create all SQLite tables if they don't exist and migrate older files."""
+    conn = sqlite3.connect(db_path or get_db_path())
     cursor = conn.cursor()
     
+    # WAL lets backups and replica refreshes read a snapshot while writers carry on
+    cursor.execute('PRAGMA journal_mode=WAL')
+    
     # Create Locker table
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS Locker (
@@ -51,6 +64,7 @@ def init_database():
             name TEXT NOT NULL,
             asset_type TEXT NOT NULL CHECK(asset_type IN ('JEWELLERY', 'DOCUMENT', 'MISC')),
             worth_on_creation REAL,
+            current_value REAL,
             details TEXT,
             creation_date TEXT,
             status TEXT NOT NULL DEFAULT 'active' CHECK(status IN ('active', 'deleted')),
@@ -86,6 +100,71 @@ def init_database():
         )
     ''')
     
+    # Create AssetValuation table (append-only value history)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS AssetValuation (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            asset_id INTEGER NOT NULL,
+            locker_id INTEGER NOT NULL,
+            org_id INTEGER NOT NULL DEFAULT 1,
+            value REAL NOT NULL,
+            source TEXT NOT NULL DEFAULT 'manual',
+            valued_at TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            FOREIGN KEY (asset_id) REFERENCES Asset(id)
+        )
+    ''')
+    
+    # Create daily valuation rollup tables (total active value at the end of each day)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS LockerValuationDaily (
+            locker_id INTEGER NOT NULL,
+            org_id INTEGER NOT NULL DEFAULT 1,
+            day TEXT NOT NULL,
+            total_value REAL NOT NULL,
+            asset_count INTEGER NOT NULL,
+            updated_at TEXT NOT NULL,
+            PRIMARY KEY (locker_id, day),
+            FOREIGN KEY (locker_id) REFERENCES Locker(id)
+        )
+    ''')
+    
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS OrgValuationDaily (
+            org_id INTEGER NOT NULL,
+            day TEXT NOT NULL,
+            total_value REAL NOT NULL,
+            asset_count INTEGER NOT NULL,
+            updated_at TEXT NOT NULL,
+            PRIMARY KEY (org_id, day)
+        )
+    ''')
+    
+    # Create ReplicationState table (version counter copied into read replicas)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS ReplicationState (
+            id INTEGER PRIMARY KEY CHECK(id = 1),
+            version INTEGER NOT NULL
+        )
+    ''')
+    cursor.execute('INSERT OR IGNORE INTO ReplicationState (id, version) VALUES (1, 0)')
+    
+    # Create AssetAttachment table (files live in the blob store, keyed by content hash)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS AssetAttachment (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            asset_id INTEGER NOT NULL,
+            blob_hash TEXT NOT NULL,
+            filename TEXT NOT NULL,
+            content_type TEXT NOT NULL,
+            size_bytes INTEGER NOT NULL,
+            status TEXT NOT NULL DEFAULT 'active' CHECK(status IN ('active', 'deleted')),
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            FOREIGN KEY (asset_id) REFERENCES Asset(id)
+        )
+    ''')
+    
     # Add status column to existing tables if they don't have it (migration)
     try:
         cursor.execute("ALTER TABLE Locker ADD COLUMN status TEXT DEFAULT 'active'")
@@ -111,9 +190,41 @@ def init_database():
     except sqlite3.OperationalError:
         pass  # Column already exists
     
+    try:
+        cursor.execute("ALTER TABLE Asset ADD COLUMN current_value REAL")
+        cursor.execute("UPDATE Asset SET current_value = worth_on_creation")
+        # Seed the valuation history with each asset's creation worth
+        cursor.execute('''
+            INSERT INTO AssetValuation (asset_id, locker_id, org_id, value, source, valued_at, created_at)
+            SELECT id, locker_id, org_id, worth_on_creation, 'creation', created_at, created_at
+            FROM Asset WHERE worth_on_creation IS NOT NULL
+        ''')
+        # Seed today's rollups so valuation queries have a starting point
+        timestamp = get_timestamp()
+        cursor.execute('''
+            INSERT INTO LockerValuationDaily (locker_id, org_id, day, total_value, asset_count, updated_at)
+            SELECT l.id, l.org_id, ?, COALESCE(SUM(a.current_value), 0), COUNT(a.id), ?
+            FROM Locker l LEFT JOIN Asset a ON a.locker_id = l.id AND a.status = 'active'
+            WHERE l.status = 'active'
+            GROUP BY l.id
+        ''', (timestamp[:10], timestamp))
+        cursor.execute('''
+            INSERT INTO OrgValuationDaily (org_id, day, total_value, asset_count, updated_at)
+            SELECT org_id, ?, COALESCE(SUM(current_value), 0), COUNT(id), ?
+            FROM Asset WHERE status = 'active'
+            GROUP BY org_id
+        ''', (timestamp[:10], timestamp))
+    except sqlite3.OperationalError:
+        pass  # Column already exists
+    
+    # Indexes for per-locker listings, per-org rollups and per-asset history
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_asset_locker ON Asset(locker_id, status)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_asset_org ON Asset(org_id, status)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_asset_valuation_asset ON AssetValuation(asset_id, valued_at)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_asset_attachment_asset ON AssetAttachment(asset_id, status)')
+    
     conn.commit()
     conn.close()
-    print("Database initialized successfully!")
 
 
 def get_timestamp():
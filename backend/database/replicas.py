@@ -0,0 +1,186 @@
+"""
+Read-only replicas of the SQLite database.
+
+Each replica is a full copy of the primary file, refreshed in one step with
+the SQLite backup API (see sqlite_copy), which reads a consistent snapshot of
+the WAL-mode primary without blocking writers. A refresh copies into a
+temporary file and renames it over the replica, so readers always open a
+complete copy.
+
+Every write transaction bumps the version counter in the ReplicationState
+table. The counter travels inside each copy, so a replica knows exactly which
+writes it contains, and lag is the difference between the primary's version
+and the replica's.
+"""
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from backend.database.db_setup import get_connection
+from backend.database.sqlite_copy import copy_database
+
+
+DEFAULT_REFRESH_INTERVAL = 5.0
+DEFAULT_MAX_STALENESS = 30.0
+
+
+def read_version(conn):
+    """Read the replication version stored in a database."""
+    row = conn.execute('SELECT version FROM ReplicationState WHERE id = 1').fetchone()
+    return row[0] if row else 0
+
+
+class Replica:
+    """One read-only copy of the primary database."""
+
+    def __init__(self, path):
+        self.path = path
+        self.version = None
+        self.refreshed_at = None
+        self.refreshed_monotonic = None
+        self.last_refresh_seconds = None
+        self.refresh_count = 0
+        self.last_error = None
+
+    def connect(self):
+        """Open the replica read-only."""
+        conn = sqlite3.connect('file:{}?mode=ro'.format(self.path), uri=True)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def refresh(self):
+        """Copy the primary into this replica, or just mark it current if the primary is unchanged."""
+        started = time.monotonic()
+        source = get_connection()
+        try:
+            # Compare versions rather than file times: in WAL mode commits land in the -wal file
+            if read_version(source) == self.version and os.path.exists(self.path):
+                self.refreshed_monotonic = started
+                return
+            copy_database(source, self.path)
+        except Exception as e:
+            self.last_error = str(e)
+            raise
+        finally:
+            source.close()
+        # Read the version from the copy itself: it is exactly what readers will see
+        target = self.connect()
+        try:
+            self.version = read_version(target)
+        finally:
+            target.close()
+        self.refreshed_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self.refreshed_monotonic = time.monotonic()
+        self.last_refresh_seconds = round(self.refreshed_monotonic - started, 3)
+        self.refresh_count += 1
+        self.last_error = None
+
+    def age(self):
+        """Seconds since the last refresh, or None if never refreshed."""
+        if self.refreshed_monotonic is None:
+            return None
+        return time.monotonic() - self.refreshed_monotonic
+
+
+class ReplicaSet:
+    """Routes reads across replicas and keeps them refreshed."""
+
+    def __init__(self, paths, refresh_interval=DEFAULT_REFRESH_INTERVAL,
+                 max_staleness=DEFAULT_MAX_STALENESS):
+        if not paths:
+            raise ValueError("At least one replica path is required")
+        self.replicas = [Replica(path) for path in paths]
+        self.refresh_interval = refresh_interval
+        self.max_staleness = max_staleness
+        self._next = 0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def choose(self, min_version):
+        """
+        Pick a replica that already contains version `min_version` and is fresh
+        enough, rotating between eligible replicas. Returns None if none qualify.
+        """
+        eligible = [replica for replica in self.replicas
+                    if replica.version is not None and replica.version >= min_version
+                    and replica.age() is not None and replica.age() <= self.max_staleness]
+        if not eligible:
+            return None
+        with self._lock:
+            self._next = (self._next + 1) % len(eligible)
+            return eligible[self._next]
+
+    def refresh_all(self):
+        """Refresh every replica from the primary, one after another."""
+        with self._refresh_lock:
+            for replica in self.replicas:
+                try:
+                    replica.refresh()
+                except Exception as e:
+                    print("Replica refresh failed for {}: {}".format(replica.path, e))
+
+    def start(self):
+        """Refresh now, then every refresh_interval seconds on a background thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self.refresh_all()
+        self._stop.clear()
+
+        def run():
+            while not self._stop.wait(self.refresh_interval):
+                self.refresh_all()
+
+        self._thread = threading.Thread(target=run, name='replica-refresh', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background refresh."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def status(self):
+        """Get replica lag metrics."""
+        conn = get_connection()
+        try:
+            primary_version = read_version(conn)
+        finally:
+            conn.close()
+        replicas = []
+        for replica in self.replicas:
+            age = replica.age()
+            replicas.append({
+                'path': replica.path,
+                'version': replica.version,
+                'lag_versions': None if replica.version is None else primary_version - replica.version,
+                'seconds_since_refresh': None if age is None else round(age, 3),
+                'last_refresh_seconds': replica.last_refresh_seconds,
+                'refreshed_at': replica.refreshed_at,
+                'refresh_count': replica.refresh_count,
+                'last_error': replica.last_error,
+                'serving': age is not None and age <= self.max_staleness,
+            })
+        return {
+            'primary_version': primary_version,
+            'refresh_interval': self.refresh_interval,
+            'max_staleness': self.max_staleness,
+            'refreshing': bool(self._thread and self._thread.is_alive()),
+            'replicas': replicas,
+        }
+
+
+def create_replica_set():
+    """Build a ReplicaSet from LOCKER_READ_REPLICAS (comma-separated paths), or None."""
+    paths = [path.strip() for path in os.environ.get('LOCKER_READ_REPLICAS', '').split(',') if path.strip()]
+    if not paths:
+        return None
+    return ReplicaSet(
+        paths,
+        refresh_interval=float(os.environ.get('LOCKER_REPLICA_REFRESH_INTERVAL', DEFAULT_REFRESH_INTERVAL)),
+        max_staleness=float(os.environ.get('LOCKER_REPLICA_MAX_STALENESS', DEFAULT_MAX_STALENESS))
+    )
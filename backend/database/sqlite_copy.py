@@ -0,0 +1,73 @@
+"""
+Copy a live SQLite database to another file with the SQLite backup API.
+
+Used for backups, snapshots and read replica refreshes. The primary runs in
+WAL mode, where a single-step copy reads a consistent snapshot without
+blocking writers. A copy made in several steps is restarted by SQLite every
+time another connection writes to the source, so under a steady write load it
+may never finish; stepped copies therefore fall back to a single step on the
+first restart.
+"""
+import os
+import sqlite3
+import time
+
+
+def copy_database(source, dest_path, pages=-1, pause=0, progress=None):
+    """
+    Copy the database open on `source` to dest_path.
+    pages=-1 copies everything in one step; a positive value copies that many
+    pages per step with `pause` seconds between steps. progress(remaining, total)
+    is called after each step. The copy is written to dest_path + '.part',
+    switched to rollback-journal mode so it is one self-contained file, and
+    renamed into place. Returns the number of pages copied.
+    """
+    if pages == 0:
+        raise ValueError("pages must be positive, or -1 to copy in one step")
+    partial_path = dest_path + '.part'
+    if os.path.exists(partial_path):
+        os.remove(partial_path)
+    pages_total = [0]
+    try:
+        if pages > 0:
+            try:
+                _backup(source, partial_path, pages, pause, progress, pages_total)
+            except _BackupRestarted:
+                os.remove(partial_path)
+                _backup(source, partial_path, -1, 0, progress, pages_total)
+        else:
+            _backup(source, partial_path, -1, 0, progress, pages_total)
+        os.replace(partial_path, dest_path)
+    except Exception:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+    return pages_total[0]
+
+
+class _BackupRestarted(Exception):
+    """A stepped backup went back to the start because the source was written to."""
+
+
+def _backup(source, partial_path, pages, pause, progress, pages_total):
+    """Run one backup attempt into partial_path."""
+    last_remaining = [None]
+
+    def on_step(status, remaining, total):
+        pages_total[0] = total
+        if progress:
+            progress(remaining, total)
+        if pages > 0:
+            if last_remaining[0] is not None and remaining >= last_remaining[0]:
+                raise _BackupRestarted()
+            last_remaining[0] = remaining
+            if remaining and pause:
+                # The source is unlocked between steps, so writers get in here
+                time.sleep(pause)
+
+    target = sqlite3.connect(partial_path)
+    try:
+        source.backup(target, pages=pages, progress=on_step)
+        target.execute('PRAGMA journal_mode=DELETE')
+    finally:
+        target.close()
@@ -0,0 +1,66 @@
+"""
+Asset attachment model for database operations.
+"""
+from backend.database.db_setup import get_timestamp
+from backend.models.repository import get_repository
+
+
+class AttachmentModel:
+    """Model class for AssetAttachment table operations."""
+
+    @staticmethod
+    def get_by_asset_id(asset_id):
+        """Get all active attachments for an asset."""
+        with get_repository().read_session() as db:
+            return db.fetch_all('''
+                SELECT * FROM AssetAttachment
+                WHERE asset_id = ? AND status = 'active'
+                ORDER BY created_at DESC, id DESC
+            ''', (asset_id,))
+
+    @staticmethod
+    def get_by_id(attachment_id, primary=False):
+        """Get an active attachment by ID (primary=True reads the primary, for read-then-write)."""
+        with get_repository().read_session(primary=primary) as db:
+            return db.fetch_one("SELECT * FROM AssetAttachment WHERE id = ? AND status = 'active'", (attachment_id,))
+
+    @staticmethod
+    def get_active_hashes():
+        """Get the set of blob hashes referenced by at least one active attachment (read from the primary)."""
+        with get_repository().read_session(primary=True) as db:
+            rows = db.fetch_all("SELECT DISTINCT blob_hash FROM AssetAttachment WHERE status = 'active'")
+        return {row['blob_hash'] for row in rows}
+
+    @staticmethod
+    def is_blob_referenced(blob_hash):
+        """Check on the primary whether any active attachment points at a blob."""
+        with get_repository().read_session(primary=True) as db:
+            row = db.fetch_one('''
+                SELECT 1 AS found FROM AssetAttachment
+                WHERE blob_hash = ? AND status = 'active'
+                LIMIT 1
+            ''', (blob_hash,))
+        return row is not None
+
+    @staticmethod
+    def create(asset_id, blob_hash, filename, content_type, size_bytes):
+        """Create a new attachment pointing at a stored blob."""
+        timestamp = get_timestamp()
+        with get_repository().session() as db:
+            return db.insert('''
+                INSERT INTO AssetAttachment (asset_id, blob_hash, filename, content_type,
+                                             size_bytes, status, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, 'active', ?, ?)
+            ''', (asset_id, blob_hash, filename, content_type, size_bytes, timestamp, timestamp))
+
+    @staticmethod
+    def delete(attachment_id):
+        """Soft delete an attachment. The blob is kept, as other attachments may share it."""
+        timestamp = get_timestamp()
+        with get_repository().session() as db:
+            rowcount = db.execute('''
+                UPDATE AssetAttachment
+                SET status = 'deleted', updated_at = ?
+                WHERE id = ? AND status = 'active'
+            ''', (timestamp, attachment_id))
+        return rowcount > 0
@@ -0,0 +1,140 @@
+"""
+Bulk model for chunked import and keyset export of lockers and assets.
+"""
+from backend.database.db_setup import get_timestamp
+
+
+LOCKER_COLUMNS = ['id', 'org_id', 'user_id', 'name', 'location_name', 'address',
+                  'status', 'created_at', 'updated_at']
+
+ASSET_COLUMNS = ['id', 'locker_id', 'org_id', 'user_id', 'name', 'asset_type',
+                 'worth_on_creation', 'current_value', 'details', 'creation_date', 'status',
+                 'created_at', 'updated_at', 'material_type', 'material_grade',
+                 'gifting_details', 'document_type']
+
+
+class BulkModel:
+    """Model class for set-based bulk operations on Locker, Asset and detail tables."""
+
+    @staticmethod
+    def begin(conn):
+        """Start a write transaction, taking the write lock up front."""
+        conn.execute('BEGIN IMMEDIATE')
+
+    @staticmethod
+    def next_id(conn, table):
+        """Get the next free id for an AUTOINCREMENT table (call inside a write transaction)."""
+        row = conn.execute('SELECT seq FROM sqlite_sequence WHERE name = ?', (table,)).fetchone()
+        seq = row[0] if row else 0
+        max_id = conn.execute('SELECT COALESCE(MAX(id), 0) FROM {}'.format(table)).fetchone()[0]
+        return max(seq, max_id) + 1
+
+    @staticmethod
+    def existing_ids(conn, table, ids):
+        """Get the subset of ids that already exist in a table."""
+        ids = list(set(ids))
+        if not ids:
+            return set()
+        placeholders = ','.join('?' * len(ids))
+        cursor = conn.execute(
+            'SELECT id FROM {} WHERE id IN ({})'.format(table, placeholders), ids)
+        return {row[0] for row in cursor.fetchall()}
+
+    @staticmethod
+    def locker_statuses(conn, locker_ids):
+        """Get the status of each locker id that exists, as {id: status}."""
+        locker_ids = list(set(locker_ids))
+        if not locker_ids:
+            return {}
+        placeholders = ','.join('?' * len(locker_ids))
+        cursor = conn.execute(
+            'SELECT id, status FROM Locker WHERE id IN ({})'.format(placeholders), locker_ids)
+        return {row[0]: row[1] for row in cursor.fetchall()}
+
+    @staticmethod
+    def insert_lockers(conn, rows):
+        """Insert a chunk of locker rows (each row must carry its id)."""
+        timestamp = get_timestamp()
+        conn.executemany('''
+            INSERT INTO Locker (id, org_id, user_id, name, location_name, address,
+                              status, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [(row['id'], row['org_id'], row['user_id'], row['name'], row['location_name'],
+               row['address'], row['status'], row['created_at'] or timestamp,
+               row['updated_at'] or timestamp) for row in rows])
+
+    @staticmethod
+    def insert_assets(conn, rows):
+        """Insert a chunk of asset rows and their detail records (each row must carry its id)."""
+        timestamp = get_timestamp()
+        conn.executemany('''
+            INSERT INTO Asset (id, locker_id, org_id, user_id, name, asset_type, worth_on_creation,
+                             current_value, details, creation_date, status, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [(row['id'], row['locker_id'], row['org_id'], row['user_id'], row['name'],
+               row['asset_type'], row['worth_on_creation'], row['current_value'], row['details'],
+               row['creation_date'], row['status'], row['created_at'] or timestamp,
+               row['updated_at'] or timestamp)
+              for row in rows])
+        conn.executemany('''
+            INSERT INTO AssetValuation (asset_id, locker_id, org_id, value, source, valued_at, created_at)
+            VALUES (?, ?, ?, ?, 'import', ?, ?)
+        ''', [(row['id'], row['locker_id'], row['org_id'], row['current_value'], timestamp, timestamp)
+              for row in rows if row['current_value'] is not None])
+        conn.executemany('''
+            INSERT INTO AssetDetail_Jewellery (asset_id, material_type, material_grade,
+                                              gifting_details, status, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', [(row['id'], row['material_type'], row['material_grade'], row['gifting_details'],
+               row['status'], row['created_at'] or timestamp, row['updated_at'] or timestamp)
+              for row in rows if row['asset_type'] == 'JEWELLERY'])
+        conn.executemany('''
+            INSERT INTO AssetDetail_Document (asset_id, document_type, status, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?)
+        ''', [(row['id'], row['document_type'], row['status'],
+               row['created_at'] or timestamp, row['updated_at'] or timestamp)
+              for row in rows if row['asset_type'] == 'DOCUMENT'])
+
+    @staticmethod
+    def iter_lockers(conn, batch_size=1000, include_deleted=False):
+        """Yield locker rows in id order, one keyset page at a time."""
+        status_filter = '' if include_deleted else "AND status = 'active'"
+        last_id = 0
+        while True:
+            cursor = conn.execute('''
+                SELECT {} FROM Locker
+                WHERE id > ? {}
+                ORDER BY id
+                LIMIT ?
+            '''.format(', '.join(LOCKER_COLUMNS), status_filter), (last_id, batch_size))
+            rows = cursor.fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield dict(row)
+            last_id = rows[-1]['id']
+
+    @staticmethod
+    def iter_assets(conn, batch_size=1000, include_deleted=False):
+        """Yield asset rows joined with their detail records in id order, one keyset page at a time."""
+        status_filter = '' if include_deleted else "AND a.status = 'active'"
+        last_id = 0
+        while True:
+            cursor = conn.execute('''
+                SELECT a.id, a.locker_id, a.org_id, a.user_id, a.name, a.asset_type,
+                       a.worth_on_creation, a.current_value, a.details, a.creation_date, a.status,
+                       a.created_at, a.updated_at, j.material_type, j.material_grade,
+                       j.gifting_details, d.document_type
+                FROM Asset a
+                LEFT JOIN AssetDetail_Jewellery j ON j.asset_id = a.id AND a.asset_type = 'JEWELLERY'
+                LEFT JOIN AssetDetail_Document d ON d.asset_id = a.id AND a.asset_type = 'DOCUMENT'
+                WHERE a.id > ? {}
+                ORDER BY a.id
+                LIMIT ?
+            '''.format(status_filter), (last_id, batch_size))
+            rows = cursor.fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield dict(row)
+            last_id = rows[-1]['id']
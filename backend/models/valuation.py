@@ -0,0 +1,203 @@
+"""
+Valuation model for database operations.
+Handles the AssetValuation history table and the LockerValuationDaily and
+OrgValuationDaily rollup tables.
+"""
+from backend.database.db_setup import get_timestamp
+from backend.models.repository import get_repository
+
+
+# Recompute one locker's total for a day from its active assets
+_LOCKER_ROLLUP_SQL = '''
+    INSERT INTO LockerValuationDaily (locker_id, org_id, day, total_value, asset_count, updated_at)
+    SELECT l.id, l.org_id, ?, COALESCE(SUM(a.current_value), 0), COUNT(a.id), ?
+    FROM Locker l LEFT JOIN Asset a ON a.locker_id = l.id AND a.status = 'active'
+    WHERE l.id = ?
+    GROUP BY l.id
+    ON CONFLICT (locker_id, day) DO UPDATE
+    SET total_value = excluded.total_value, asset_count = excluded.asset_count,
+        updated_at = excluded.updated_at
+'''
+
+# Recompute one org's total for a day from its active assets
+_ORG_ROLLUP_SQL = '''
+    INSERT INTO OrgValuationDaily (org_id, day, total_value, asset_count, updated_at)
+    SELECT ?, ?, COALESCE(SUM(current_value), 0), COUNT(id), ?
+    FROM Asset WHERE org_id = ? AND status = 'active'
+    ON CONFLICT (org_id, day) DO UPDATE
+    SET total_value = excluded.total_value, asset_count = excluded.asset_count,
+        updated_at = excluded.updated_at
+'''
+
+
+def _refresh_rollups(db, locker_ids, timestamp):
+    """Recompute today's rollups for the given lockers and their orgs."""
+    locker_ids = sorted(set(locker_ids))
+    if not locker_ids:
+        return
+    day = timestamp[:10]
+    db.executemany(_LOCKER_ROLLUP_SQL, [(day, timestamp, locker_id) for locker_id in locker_ids])
+    placeholders = ','.join('?' * len(locker_ids))
+    rows = db.fetch_all('SELECT DISTINCT org_id FROM Locker WHERE id IN ({})'.format(placeholders), locker_ids)
+    db.executemany(_ORG_ROLLUP_SQL, [(row['org_id'], day, timestamp, row['org_id']) for row in rows])
+
+
+def _revaluation_filter(asset_type, material_type, material_grade, org_id, locker_id):
+    """Build the WHERE clause and parameters selecting assets for a bulk revaluation."""
+    clauses = ["a.status = 'active'", 'a.asset_type = ?']
+    params = [asset_type]
+    if material_type is not None or material_grade is not None:
+        detail = ["j.asset_id = a.id", "j.status = 'active'"]
+        if material_type is not None:
+            detail.append('j.material_type = ?')
+            params.append(material_type)
+        if material_grade is not None:
+            detail.append('j.material_grade = ?')
+            params.append(material_grade)
+        clauses.append('EXISTS (SELECT 1 FROM AssetDetail_Jewellery j WHERE {})'.format(' AND '.join(detail)))
+    if org_id is not None:
+        clauses.append('a.org_id = ?')
+        params.append(org_id)
+    if locker_id is not None:
+        clauses.append('a.locker_id = ?')
+        params.append(locker_id)
+    return ' AND '.join(clauses), params
+
+
+class ValuationModel:
+    """Model class for valuation history and rollup operations."""
+
+    @staticmethod
+    def record(asset_id, value, source='manual', valued_at=None):
+        """Set an active asset's current value and append it to the history."""
+        timestamp = get_timestamp()
+        with get_repository().session() as db:
+            db.begin_write()
+            asset = db.fetch_one("SELECT locker_id FROM Asset WHERE id = ? AND status = 'active'", (asset_id,))
+            if not asset:
+                return False
+            db.execute('''
+                UPDATE Asset SET current_value = ?, updated_at = ?
+                WHERE id = ?
+            ''', (value, timestamp, asset_id))
+            db.execute('''
+                INSERT INTO AssetValuation (asset_id, locker_id, org_id, value, source, valued_at, created_at)
+                SELECT id, locker_id, org_id, ?, ?, ?, ? FROM Asset WHERE id = ?
+            ''', (value, source, valued_at or timestamp, timestamp, asset_id))
+            _refresh_rollups(db, [asset['locker_id']], timestamp)
+        return True
+
+    @staticmethod
+    def correct_creation_value(asset_id, value):
+        """
+        Correct the 'creation' entry of an asset's history after its worth_on_creation was edited.
+        The current value (and the rollups) follow only if the asset was never valued since
+        it was created or imported; a later valuation is left in place.
+        Returns False if the asset is not active.
+        """
+        timestamp = get_timestamp()
+        with get_repository().session() as db:
+            db.begin_write()
+            asset = db.fetch_one("SELECT locker_id FROM Asset WHERE id = ? AND status = 'active'", (asset_id,))
+            if not asset:
+                return False
+            updated = db.execute('''
+                UPDATE AssetValuation SET value = ?
+                WHERE asset_id = ? AND source = 'creation'
+            ''', (value, asset_id))
+            if not updated:
+                db.execute('''
+                    INSERT INTO AssetValuation (asset_id, locker_id, org_id, value, source, valued_at, created_at)
+                    SELECT id, locker_id, org_id, ?, 'creation', created_at, ? FROM Asset WHERE id = ?
+                ''', (value, timestamp, asset_id))
+            revalued = db.fetch_one('''
+                SELECT 1 FROM AssetValuation
+                WHERE asset_id = ? AND source NOT IN ('creation', 'import')
+                LIMIT 1
+            ''', (asset_id,))
+            if not revalued:
+                db.execute('''
+                    UPDATE Asset SET current_value = ?, updated_at = ?
+                    WHERE id = ?
+                ''', (value, timestamp, asset_id))
+                _refresh_rollups(db, [asset['locker_id']], timestamp)
+        return True
+
+    @staticmethod
+    def bulk_revalue(asset_type, multiplier=None, value=None, material_type=None,
+                     material_grade=None, org_id=None, locker_id=None, source='revaluation'):
+        """
+        Revalue every matching active asset in one transaction.
+        With multiplier, each asset's current value is scaled; with value, it is replaced.
+        Returns the number of assets revalued.
+        """
+        where, params = _revaluation_filter(asset_type, material_type, material_grade, org_id, locker_id)
+        if multiplier is not None:
+            new_value = 'ROUND(CAST(COALESCE(a.current_value, a.worth_on_creation) * ? AS NUMERIC), 2)'
+            where += ' AND COALESCE(a.current_value, a.worth_on_creation) IS NOT NULL'
+            value_param = multiplier
+        else:
+            new_value = '?'
+            value_param = value
+
+        timestamp = get_timestamp()
+        with get_repository().session() as db:
+            db.begin_write()
+            # Capture the affected lockers first; the same filter is reused below
+            rows = db.fetch_all('SELECT DISTINCT a.locker_id FROM Asset a WHERE {}'.format(where), params)
+            count = db.execute('''
+                UPDATE Asset AS a SET current_value = {}, updated_at = ?
+                WHERE {}
+            '''.format(new_value, where), [value_param, timestamp] + params)
+            # The filter does not depend on current_value, so it selects the same rows again
+            db.execute('''
+                INSERT INTO AssetValuation (asset_id, locker_id, org_id, value, source, valued_at, created_at)
+                SELECT a.id, a.locker_id, a.org_id, a.current_value, ?, ?, ?
+                FROM Asset a WHERE {}
+            '''.format(where), [source, timestamp, timestamp] + params)
+            _refresh_rollups(db, [row['locker_id'] for row in rows], timestamp)
+        return count
+
+    @staticmethod
+    def refresh_rollups(locker_ids):
+        """Recompute today's rollups after assets were added, removed or changed."""
+        with get_repository().session() as db:
+            _refresh_rollups(db, locker_ids, get_timestamp())
+
+    @staticmethod
+    def get_history(asset_id, limit=100):
+        """Get the valuation history of an asset, newest first."""
+        with get_repository().read_session() as db:
+            return db.fetch_all('''
+                SELECT value, source, valued_at FROM AssetValuation
+                WHERE asset_id = ?
+                ORDER BY valued_at DESC, id DESC
+                LIMIT ?
+            ''', (asset_id, limit))
+
+    @staticmethod
+    def get_locker_series(locker_id, from_day, to_day):
+        """Get daily rollups for a locker between two days, plus the last rollup before the range."""
+        return ValuationModel._get_series('LockerValuationDaily', 'locker_id', locker_id, from_day, to_day)
+
+    @staticmethod
+    def get_org_series(org_id, from_day, to_day):
+        """Get daily rollups for an org between two days, plus the last rollup before the range."""
+        return ValuationModel._get_series('OrgValuationDaily', 'org_id', org_id, from_day, to_day)
+
+    @staticmethod
+    def _get_series(table, key, key_value, from_day, to_day):
+        """Read a rollup series from one of the daily rollup tables."""
+        with get_repository().read_session() as db:
+            opening = db.fetch_one('''
+                SELECT day, total_value, asset_count FROM {table}
+                WHERE {key} = ? AND day < ?
+                ORDER BY day DESC
+                LIMIT 1
+            '''.format(table=table, key=key), (key_value, from_day))
+            points = db.fetch_all('''
+                SELECT day, total_value, asset_count FROM {table}
+                WHERE {key} = ? AND day BETWEEN ? AND ?
+                ORDER BY day
+            '''.format(table=table, key=key), (key_value, from_day, to_day))
+        return opening, points
@@ -3,6 +3,15 @@ Asset service/presenter for business logic.
 """
 from backend.models.asset import AssetModel
 from backend.models.asset_detail import AssetDetailJewelleryModel, AssetDetailDocumentModel
+from backend.models.valuation import ValuationModel
+
+
+# Columns of the compact listing format. Internal fields (status, org_id, user_id)
+# and locker_id, which is already in the URL, are left out. Detail fields are
+# flattened into columns so their names are not repeated on every row.
+COMPACT_ASSET_COLUMNS = ['id', 'name', 'asset_type', 'worth_on_creation', 'current_value',
+                         'details', 'creation_date', 'created_at', 'updated_at',
+                         'material_type', 'material_grade', 'gifting_details', 'document_type']
 
 
 class AssetService:
@@ -34,6 +43,18 @@ class AssetService:
         
         return assets
     
+    @staticmethod
+    def to_compact(assets):
+        """Convert an asset listing to columnar form: column names once, rows as arrays."""
+        rows = []
+        for asset in assets:
+            flat = dict(asset, **asset.get('jewellery_details', {}), **asset.get('document_details', {}))
+            rows.append([flat.get(column) for column in COMPACT_ASSET_COLUMNS])
+        return {
+            'columns': COMPACT_ASSET_COLUMNS,
+            'rows': rows
+        }
+    
     @staticmethod
     def get_asset_by_id(asset_id):
         """Get an asset by ID with its detail information."""
@@ -96,12 +117,19 @@ class AssetService:
                 document_type=data.get('document_type')
             )
         
+        # Start the valuation history and refresh the locker's daily rollup
+        if data.get('worth_on_creation') is not None:
+            ValuationModel.record(asset_id, data['worth_on_creation'], source='creation')
+        else:
+            ValuationModel.refresh_rollups([locker_id])
+        
         return AssetService.get_asset_by_id(asset_id)
     
     @staticmethod
     def update_asset(asset_id, data):
         """Update an asset and its detail record."""
-        asset = AssetModel.get_by_id(asset_id)
+        # Read from the primary: these values are written back
+        asset = AssetModel.get_by_id(asset_id, primary=True)
         if not asset:
             raise ValueError("Asset not found")
         
@@ -127,7 +155,7 @@ class AssetService:
         
         # Create or update detail record based on new type
         if new_type == 'JEWELLERY':
-            existing = AssetDetailJewelleryModel.get_by_asset_id(asset_id)
+            existing = AssetDetailJewelleryModel.get_by_asset_id(asset_id, primary=True)
             if existing:
                 AssetDetailJewelleryModel.update(
                     asset_id=asset_id,
@@ -143,7 +171,7 @@ class AssetService:
                     gifting_details=data.get('gifting_details')
                 )
         elif new_type == 'DOCUMENT':
-            existing = AssetDetailDocumentModel.get_by_asset_id(asset_id)
+            existing = AssetDetailDocumentModel.get_by_asset_id(asset_id, primary=True)
             if existing:
                 AssetDetailDocumentModel.update(
                     asset_id=asset_id,
@@ -155,14 +183,21 @@ class AssetService:
                     document_type=data.get('document_type')
                 )
         
+        # An edited worth corrects the creation entry; it is not a new valuation
+        new_worth = data.get('worth_on_creation')
+        if new_worth is not None and new_worth != asset.get('worth_on_creation'):
+            ValuationModel.correct_creation_value(asset_id, new_worth)
+        
         return AssetService.get_asset_by_id(asset_id)
     
     @staticmethod
     def delete_asset(asset_id):
         """Delete an asset (cascade will delete detail records)."""
-        asset = AssetModel.get_by_id(asset_id)
+        asset = AssetModel.get_by_id(asset_id, primary=True)
         if not asset:
             raise ValueError("Asset not found")
         
-        return AssetModel.delete(asset_id)
+        deleted = AssetModel.delete(asset_id)
+        ValuationModel.refresh_rollups([asset['locker_id']])
+        return deleted
 
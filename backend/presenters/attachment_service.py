@@ -0,0 +1,112 @@
+"""
+Attachment service/presenter for business logic.
+"""
+import mimetypes
+import os
+
+from backend.models.asset import AssetModel
+from backend.models.attachment import AttachmentModel
+from backend.storage.blob_store import get_blob_store, DEFAULT_GC_GRACE_SECONDS
+
+
+ALLOWED_CONTENT_TYPES = {
+    'application/pdf',
+    'image/jpeg',
+    'image/png',
+    'image/gif',
+    'image/webp',
+    'image/tiff',
+}
+
+MAX_FILENAME_LENGTH = 255
+
+
+def get_max_attachment_bytes():
+    """Get the largest accepted upload (LOCKER_MAX_ATTACHMENT_BYTES, default 100 MB)."""
+    return int(os.environ.get('LOCKER_MAX_ATTACHMENT_BYTES', str(100 * 1024 * 1024)))
+
+
+def _clean_filename(filename):
+    """Strip any directory part from a client-supplied file name."""
+    name = os.path.basename((filename or '').replace('\\', '/')).strip()
+    if not name:
+        raise ValueError("filename is required")
+    return name[:MAX_FILENAME_LENGTH]
+
+
+class AttachmentService:
+    """Service class for attachment business logic."""
+
+    @staticmethod
+    def get_attachments(asset_id):
+        """Get all attachments of an asset."""
+        if not AssetModel.get_by_id(asset_id):
+            raise LookupError("Asset not found")
+        return [AttachmentService._with_thumbnail(attachment)
+                for attachment in AttachmentModel.get_by_asset_id(asset_id)]
+
+    @staticmethod
+    def get_attachment(attachment_id):
+        """Get an attachment's metadata."""
+        attachment = AttachmentModel.get_by_id(attachment_id)
+        if not attachment:
+            raise LookupError("Attachment not found")
+        return AttachmentService._with_thumbnail(attachment)
+
+    @staticmethod
+    def upload(asset_id, stream, filename, content_type=None):
+        """
+        Store a file read from a binary stream and attach it to an asset.
+        Identical files are stored once and shared between attachments. If recording
+        the attachment fails, the stored blob is left for collect_garbage to remove.
+        """
+        filename = _clean_filename(filename)
+        content_type = (content_type or '').split(';')[0].strip().lower()
+        if not content_type or content_type == 'application/octet-stream':
+            content_type = mimetypes.guess_type(filename)[0] or ''
+        if content_type not in ALLOWED_CONTENT_TYPES:
+            raise ValueError("content type must be one of: {}".format(', '.join(sorted(ALLOWED_CONTENT_TYPES))))
+        if not AssetModel.get_by_id(asset_id, primary=True):
+            raise LookupError("Asset not found")
+
+        store = get_blob_store()
+        blob_hash, size = store.write_stream(stream, max_size=get_max_attachment_bytes())
+        attachment_id = AttachmentModel.create(asset_id, blob_hash, filename, content_type, size)
+        store.request_thumbnail(blob_hash, content_type)
+        return AttachmentService.get_attachment(attachment_id)
+
+    @staticmethod
+    def get_content_path(attachment_id):
+        """Get an attachment's metadata and the path of its stored file."""
+        attachment = AttachmentService.get_attachment(attachment_id)
+        path = get_blob_store().path_for(attachment['blob_hash'])
+        if not os.path.exists(path):
+            raise LookupError("Attachment content is missing")
+        return attachment, path
+
+    @staticmethod
+    def get_thumbnail_path(attachment_id):
+        """Get the path of an attachment's thumbnail."""
+        attachment = AttachmentService.get_attachment(attachment_id)
+        if not attachment['has_thumbnail']:
+            raise LookupError("Thumbnail not available")
+        return attachment, get_blob_store().thumbnail_path_for(attachment['blob_hash'])
+
+    @staticmethod
+    def delete_attachment(attachment_id):
+        """Delete an attachment."""
+        if not AttachmentModel.delete(attachment_id):
+            raise LookupError("Attachment not found")
+        return True
+
+    @staticmethod
+    def collect_garbage(grace_seconds=DEFAULT_GC_GRACE_SECONDS):
+        """Delete stored files that no active attachment references."""
+        return get_blob_store().collect_garbage(AttachmentModel.get_active_hashes(),
+                                                AttachmentModel.is_blob_referenced, grace_seconds)
+
+    @staticmethod
+    def _with_thumbnail(attachment):
+        """Add whether a thumbnail is ready to an attachment record."""
+        attachment['has_thumbnail'] = get_blob_store().has_thumbnail(attachment['blob_hash'])
+        return attachment
@@ -2,6 +2,7 @@
 Locker service/presenter for business logic.
 """
 from backend.models.locker import LockerModel
+from backend.models.valuation import ValuationModel
 
 
 class LockerService:
@@ -33,7 +34,8 @@ class LockerService:
     @staticmethod
     def update_locker(locker_id, data):
         """Update an existing locker."""
-        locker = LockerModel.get_by_id(locker_id)
+        # Read from the primary: these values are written back
+        locker = LockerModel.get_by_id(locker_id, primary=True)
         if not locker:
             raise ValueError("Locker not found")
         
@@ -47,9 +49,11 @@ class LockerService:
     @staticmethod
     def delete_locker(locker_id):
         """Delete a locker."""
-        locker = LockerModel.get_by_id(locker_id)
+        locker = LockerModel.get_by_id(locker_id, primary=True)
         if not locker:
             raise ValueError("Locker not found")
         
-        return LockerModel.delete(locker_id)
+        deleted = LockerModel.delete(locker_id)
+        ValuationModel.refresh_rollups([locker_id])
+        return deleted
 
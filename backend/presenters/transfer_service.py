@@ -0,0 +1,366 @@
+"""
+Transfer service/presenter for bulk import and export of lockers and assets.
+Streams CSV/JSONL in both directions so memory stays bounded by the chunk size.
+"""
+import csv
+import io
+import json
+import re
+import sqlite3
+import time
+
+from backend.database.db_setup import get_connection
+from backend.models.bulk import BulkModel, LOCKER_COLUMNS, ASSET_COLUMNS
+from backend.models.repository import get_repository
+from backend.models.valuation import ValuationModel
+
+
+ENTITIES = ('lockers', 'assets')
+FORMATS = ('csv', 'jsonl')
+DEFAULT_CHUNK_SIZE = 500
+MAX_REPORTED_ERRORS = 1000
+
+
+def _value(record, key):
+    """Get a field from a record, treating empty strings as missing."""
+    value = record.get(key)
+    if isinstance(value, str):
+        value = value.strip()
+        if value == '':
+            return None
+    return value
+
+
+def _int_value(record, key, default=None):
+    """Get an integer field from a record; floats, booleans and strings like '1.7' are rejected."""
+    value = _value(record, key)
+    if value is None:
+        return default
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError("{} must be an integer".format(key))
+    if isinstance(value, str) and not re.fullmatch(r'[+-]?[0-9]+', value):
+        raise ValueError("{} must be an integer".format(key))
+    return int(value)
+
+
+def _float_value(record, key):
+    """Get a numeric field from a record."""
+    value = _value(record, key)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError("{} must be a number".format(key))
+
+
+def _status_value(record):
+    """Get the status field from a record, defaulting to active."""
+    status = _value(record, 'status') or 'active'
+    if status not in ('active', 'deleted'):
+        raise ValueError("status must be active or deleted")
+    return status
+
+
+def _normalize_locker(record):
+    """Validate a locker record and convert it to a row for insertion."""
+    row = {
+        'id': _int_value(record, 'id'),
+        'org_id': _int_value(record, 'org_id', 1),
+        'user_id': _int_value(record, 'user_id', 1),
+        'name': _value(record, 'name'),
+        'location_name': _value(record, 'location_name'),
+        'address': _value(record, 'address'),
+        'status': _status_value(record),
+        'created_at': _value(record, 'created_at'),
+        'updated_at': _value(record, 'updated_at'),
+    }
+    if not row['name'] or not row['location_name'] or not row['address']:
+        raise ValueError("Name, location_name, and address are required")
+    return row
+
+
+def _normalize_asset(record):
+    """Validate an asset record and convert it to a row for insertion."""
+    worth = _float_value(record, 'worth_on_creation')
+    current_value = _float_value(record, 'current_value')
+    row = {
+        'id': _int_value(record, 'id'),
+        'locker_id': _int_value(record, 'locker_id'),
+        'org_id': _int_value(record, 'org_id', 1),
+        'user_id': _int_value(record, 'user_id', 1),
+        'name': _value(record, 'name'),
+        'asset_type': _value(record, 'asset_type'),
+        'worth_on_creation': worth,
+        'current_value': worth if current_value is None else current_value,
+        'details': _value(record, 'details'),
+        'creation_date': _value(record, 'creation_date'),
+        'status': _status_value(record),
+        'created_at': _value(record, 'created_at'),
+        'updated_at': _value(record, 'updated_at'),
+        'material_type': _value(record, 'material_type'),
+        'material_grade': _value(record, 'material_grade'),
+        'gifting_details': _value(record, 'gifting_details'),
+        'document_type': _value(record, 'document_type'),
+    }
+    if row['locker_id'] is None:
+        raise ValueError("locker_id is required")
+    if not row['name'] or not row['asset_type']:
+        raise ValueError("Name and asset_type are required")
+    if row['asset_type'] not in ['JEWELLERY', 'DOCUMENT', 'MISC']:
+        raise ValueError("asset_type must be JEWELLERY, DOCUMENT, or MISC")
+    return row
+
+
+def _strip_bom(lines):
+    """Drop a UTF-8 byte order mark from the first line (spreadsheet exports often add one)."""
+    first = True
+    for line in lines:
+        if first:
+            line = line.lstrip('\ufeff')
+            first = False
+        yield line
+
+
+def _read_records(lines, fmt):
+    """Yield (row_number, record) pairs from CSV or JSONL text lines."""
+    lines = _strip_bom(lines)
+    if fmt == 'csv':
+        for row_number, record in enumerate(csv.DictReader(lines), start=1):
+            yield row_number, record
+        return
+    row_number = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield row_number, ValueError("Invalid JSON: {}".format(e))
+            continue
+        if not isinstance(record, dict):
+            yield row_number, ValueError("Each JSON line must be an object")
+            continue
+        yield row_number, record
+
+
+class TransferService:
+    """Service class for streaming bulk import and export."""
+
+    @staticmethod
+    def _require_sqlite():
+        """Bulk transfer works on the SQLite file directly."""
+        if get_repository().name != 'sqlite':
+            raise ValueError("Bulk import/export is only available with the SQLite backend")
+
+    @staticmethod
+    def _record_error(stats, row_number, message):
+        """Count a failed row, keeping at most MAX_REPORTED_ERRORS messages."""
+        stats['rows_failed'] += 1
+        if len(stats['errors']) < MAX_REPORTED_ERRORS:
+            stats['errors'].append({'row': row_number, 'error': message})
+
+    @staticmethod
+    def _prepare_chunk(conn, entity, chunk):
+        """
+        Check references and id conflicts, then assign ids to rows that have none.
+        Assets need an existing locker, and active assets an active one.
+        Returns the rows to insert and a list of (row_number, error) rejections.
+        """
+        table = 'Locker' if entity == 'lockers' else 'Asset'
+        explicit_ids = [row['id'] for _, row in chunk if row['id'] is not None]
+        taken = BulkModel.existing_ids(conn, table, explicit_ids)
+        if entity == 'assets':
+            lockers = BulkModel.locker_statuses(conn, [row['locker_id'] for _, row in chunk])
+
+        accepted = []
+        rejected = []
+        seen = set()
+        for row_number, row in chunk:
+            if row['id'] is not None and (row['id'] in taken or row['id'] in seen):
+                rejected.append((row_number, "id {} already exists".format(row['id'])))
+                continue
+            if entity == 'assets' and row['locker_id'] not in lockers:
+                rejected.append((row_number, "Locker not found"))
+                continue
+            # Deleted assets may sit in deleted lockers (as in an include_deleted export)
+            if entity == 'assets' and row['status'] == 'active' and lockers[row['locker_id']] != 'active':
+                rejected.append((row_number, "Locker is deleted"))
+                continue
+            if row['id'] is not None:
+                seen.add(row['id'])
+            accepted.append(dict(row))
+
+        next_id = max([BulkModel.next_id(conn, table)] + [i + 1 for i in seen])
+        for row in accepted:
+            if row['id'] is None:
+                row['id'] = next_id
+                next_id += 1
+        return accepted, rejected
+
+    @staticmethod
+    def _commit(conn):
+        """Commit a bulk write, stamping it with a replication version so replicas see the lag."""
+        get_repository().stamp_write(conn)
+        conn.commit()
+
+    @staticmethod
+    def _write_chunk(conn, entity, chunk, stats):
+        """
+        Insert one chunk in a single transaction; on a constraint error retry row by row.
+        If the database cannot be written (e.g. it stays locked), the chunk's rows are
+        reported as failed and the import moves on to the next chunk.
+        """
+        insert = BulkModel.insert_lockers if entity == 'lockers' else BulkModel.insert_assets
+        try:
+            BulkModel.begin(conn)
+            rows, rejected = TransferService._prepare_chunk(conn, entity, chunk)
+            insert(conn, rows)
+            TransferService._commit(conn)
+        except sqlite3.IntegrityError:
+            conn.rollback()
+        except sqlite3.OperationalError as e:
+            conn.rollback()
+            for row_number, _ in chunk:
+                TransferService._record_error(stats, row_number, str(e))
+            return
+        else:
+            stats['rows_inserted'] += len(rows)
+            for row_number, message in rejected:
+                TransferService._record_error(stats, row_number, message)
+            return
+
+        for row_number, row in chunk:
+            try:
+                BulkModel.begin(conn)
+                rows, rejected = TransferService._prepare_chunk(conn, entity, [(row_number, row)])
+                insert(conn, rows)
+                TransferService._commit(conn)
+            except (sqlite3.IntegrityError, sqlite3.OperationalError) as e:
+                conn.rollback()
+                rejected = [(row_number, str(e))]
+            else:
+                stats['rows_inserted'] += len(rows)
+            for rejected_row, message in rejected:
+                TransferService._record_error(stats, rejected_row, message)
+
+    @staticmethod
+    def import_records(entity, lines, fmt, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+        """
+        Import locker or asset records from an iterable of CSV/JSONL text lines.
+        Rows are written in chunks of chunk_size, one transaction per chunk.
+        Returns a stats dictionary with counts, throughput and per-row errors.
+        """
+        if entity not in ENTITIES:
+            raise ValueError("entity must be lockers or assets")
+        if fmt not in FORMATS:
+            raise ValueError("format must be csv or jsonl")
+        TransferService._require_sqlite()
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+
+        normalize = _normalize_locker if entity == 'lockers' else _normalize_asset
+        stats = {
+            'entity': entity,
+            'rows_read': 0,
+            'rows_inserted': 0,
+            'rows_failed': 0,
+            'errors': [],
+        }
+        started = time.monotonic()
+        pending_rollups = set()
+        conn = get_connection()
+        try:
+            chunk = []
+            for row_number, record in _read_records(lines, fmt):
+                stats['rows_read'] += 1
+                try:
+                    if isinstance(record, Exception):
+                        raise record
+                    chunk.append((row_number, normalize(record)))
+                except ValueError as e:
+                    TransferService._record_error(stats, row_number, str(e))
+                if len(chunk) >= chunk_size:
+                    TransferService._flush(conn, entity, chunk, stats, started, progress, pending_rollups)
+                    chunk = []
+            if chunk:
+                TransferService._flush(conn, entity, chunk, stats, started, progress, pending_rollups)
+        finally:
+            conn.close()
+
+        if pending_rollups:
+            error = TransferService._refresh_rollups(pending_rollups)
+            if error:
+                stats['rollup_error'] = error
+        TransferService._update_rate(stats, started)
+        return stats
+
+    @staticmethod
+    def _flush(conn, entity, chunk, stats, started, progress, pending_rollups):
+        """Write a chunk, refresh valuation rollups for its lockers and report progress."""
+        TransferService._write_chunk(conn, entity, chunk, stats)
+        if entity == 'assets':
+            pending_rollups.update(row['locker_id'] for _, row in chunk)
+            TransferService._refresh_rollups(pending_rollups)
+        TransferService._update_rate(stats, started)
+        if progress:
+            progress(stats)
+
+    @staticmethod
+    def _refresh_rollups(pending_rollups):
+        """
+        Refresh rollups for the pending lockers and clear them. If the database is
+        busy they stay pending for the next try; returns the error in that case.
+        """
+        try:
+            ValuationModel.refresh_rollups(list(pending_rollups))
+        except sqlite3.OperationalError as e:
+            return str(e)
+        pending_rollups.clear()
+        return None
+
+    @staticmethod
+    def _update_rate(stats, started):
+        """Refresh elapsed time and rows/sec in the stats dictionary."""
+        elapsed = time.monotonic() - started
+        stats['elapsed_seconds'] = round(elapsed, 3)
+        stats['rows_per_second'] = round(stats['rows_read'] / elapsed, 1) if elapsed > 0 else 0.0
+
+    @staticmethod
+    def export_records(entity, fmt, include_deleted=False, batch_size=1000):
+        """
+        Yield locker or asset records as CSV/JSONL text, walking the table by id.
+        Only one batch of rows is held in memory at a time.
+        """
+        if entity not in ENTITIES:
+            raise ValueError("entity must be lockers or assets")
+        if fmt not in FORMATS:
+            raise ValueError("format must be csv or jsonl")
+        TransferService._require_sqlite()
+
+        columns = LOCKER_COLUMNS if entity == 'lockers' else ASSET_COLUMNS
+        iterate = BulkModel.iter_lockers if entity == 'lockers' else BulkModel.iter_assets
+        conn = get_connection()
+        try:
+            buffer = io.StringIO()
+            writer = None
+            if fmt == 'csv':
+                writer = csv.DictWriter(buffer, fieldnames=columns, lineterminator='\n')
+                writer.writeheader()
+            count = 0
+            for row in iterate(conn, batch_size=batch_size, include_deleted=include_deleted):
+                if writer:
+                    writer.writerow(row)
+                else:
+                    buffer.write(json.dumps(row))
+                    buffer.write('\n')
+                count += 1
+                if count % batch_size == 0:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+            if buffer.tell():
+                yield buffer.getvalue()
+        finally:
+            conn.close()
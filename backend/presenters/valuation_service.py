@@ -0,0 +1,119 @@
+"""
+Valuation service/presenter for business logic.
+"""
+import re
+from datetime import datetime, timedelta
+
+from backend.models.asset import AssetModel
+from backend.models.locker import LockerModel
+from backend.models.valuation import ValuationModel
+
+
+DEFAULT_RANGE_DAYS = 30
+
+
+def _parse_number(data, key):
+    """Get a numeric field from request data."""
+    value = data.get(key)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError("{} must be a number".format(key))
+
+
+def _parse_id(data, key):
+    """Get an optional integer id field from request data; floats, booleans and other strings are rejected."""
+    value = data.get(key)
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError("{} must be an integer".format(key))
+    if isinstance(value, str) and not re.fullmatch(r'[0-9]+', value.strip()):
+        raise ValueError("{} must be an integer".format(key))
+    return int(value)
+
+
+def _parse_range(from_day, to_day):
+    """Validate a YYYY-MM-DD date range, defaulting to the last DEFAULT_RANGE_DAYS days."""
+    try:
+        end = datetime.strptime(to_day, '%Y-%m-%d') if to_day else datetime.now()
+        start = datetime.strptime(from_day, '%Y-%m-%d') if from_day else end - timedelta(days=DEFAULT_RANGE_DAYS)
+    except ValueError:
+        raise ValueError("from and to must be dates in YYYY-MM-DD format")
+    if start > end:
+        raise ValueError("from must not be after to")
+    return start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d')
+
+
+class ValuationService:
+    """Service class for valuation business logic."""
+
+    @staticmethod
+    def record_valuation(asset_id, data):
+        """Record a new value for an asset."""
+        value = _parse_number(data, 'value')
+        if value is None:
+            raise ValueError("value is required")
+        if not AssetModel.get_by_id(asset_id, primary=True):
+            raise LookupError("Asset not found")
+        ValuationModel.record(asset_id, value, source=data.get('source') or 'manual')
+        return ValuationModel.get_history(asset_id)
+
+    @staticmethod
+    def get_asset_history(asset_id):
+        """Get the valuation history of an asset."""
+        if not AssetModel.get_by_id(asset_id):
+            raise LookupError("Asset not found")
+        return ValuationModel.get_history(asset_id)
+
+    @staticmethod
+    def bulk_revalue(data):
+        """
+        Revalue matching assets in one statement, e.g. apply a gold price change to
+        all JEWELLERY of a given material_type/material_grade.
+        """
+        asset_type = data.get('asset_type', 'JEWELLERY')
+        if asset_type not in ['JEWELLERY', 'DOCUMENT', 'MISC']:
+            raise ValueError("asset_type must be JEWELLERY, DOCUMENT, or MISC")
+        org_id = _parse_id(data, 'org_id')
+        locker_id = _parse_id(data, 'locker_id')
+        multiplier = _parse_number(data, 'multiplier')
+        value = _parse_number(data, 'value')
+        if (multiplier is None) == (value is None):
+            raise ValueError("Exactly one of multiplier or value is required")
+        if multiplier is not None and multiplier < 0:
+            raise ValueError("multiplier must not be negative")
+        if asset_type != 'JEWELLERY' and (data.get('material_type') or data.get('material_grade')):
+            raise ValueError("material_type and material_grade only apply to JEWELLERY")
+
+        count = ValuationModel.bulk_revalue(
+            asset_type=asset_type,
+            multiplier=multiplier,
+            value=value,
+            material_type=data.get('material_type'),
+            material_grade=data.get('material_grade'),
+            org_id=org_id,
+            locker_id=locker_id,
+            source=data.get('source') or 'revaluation'
+        )
+        return {'assets_revalued': count}
+
+    @staticmethod
+    def get_locker_valuation(locker_id, from_day=None, to_day=None):
+        """Get a locker's daily portfolio value over a date range."""
+        if not LockerModel.get_by_id(locker_id):
+            raise LookupError("Locker not found")
+        from_day, to_day = _parse_range(from_day, to_day)
+        opening, points = ValuationModel.get_locker_series(locker_id, from_day, to_day)
+        return {'locker_id': locker_id, 'from': from_day, 'to': to_day,
+                'opening': opening, 'points': points}
+
+    @staticmethod
+    def get_org_valuation(org_id, from_day=None, to_day=None):
+        """Get an org's daily portfolio value over a date range."""
+        from_day, to_day = _parse_range(from_day, to_day)
+        opening, points = ValuationModel.get_org_series(org_id, from_day, to_day)
+        return {'org_id': org_id, 'from': from_day, 'to': to_day,
+                'opening': opening, 'points': points}
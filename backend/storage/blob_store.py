@@ -0,0 +1,252 @@
+"""
+Content-addressed blob store on local disk.
+
+Files are stored once per SHA-256 of their contents under
+<root>/<first 2 hex chars>/<next 2 hex chars>/<hash>, so identical uploads
+share one file. Uploads are streamed to a temporary file in fixed-size
+chunks while being hashed, then renamed into place; a file is never held
+in memory as a whole.
+
+Thumbnails for images are generated on a small worker pool when the optional
+Pillow package is installed.
+
+Blobs no longer referenced by any attachment are removed by collect_garbage,
+which spares files modified within a grace period so uploads that have not
+been recorded yet survive. Storing content that is already present touches
+the existing file; collection renames a blob aside before its final checks,
+so an upload racing with it either refreshes the file in time or stores a
+new copy.
+
+Files are created with the process umask (not mkstemp's 0600), so a front-end
+server can read them when serving through X-Sendfile.
+"""
+import hashlib
+import os
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; without it no thumbnails are made
+    Image = None
+
+from backend.database.db_setup import get_db_path
+
+
+CHUNK_SIZE = 64 * 1024
+THUMBNAIL_SIZE = (256, 256)
+THUMBNAIL_WORKERS = 2
+DEFAULT_GC_GRACE_SECONDS = 3600
+BLOB_NAME = re.compile(r'[0-9a-f]{64}')
+TOMBSTONE_SUFFIX = '.gc'
+
+
+def _create_temp_file(directory, suffix='.part'):
+    """Create a uniquely named file for writing, with umask permissions. Returns (fd, path)."""
+    path = os.path.join(directory, uuid.uuid4().hex + suffix)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0), 0o666)
+    return fd, path
+
+
+def _generate_thumbnail(source_path, thumbnail_path):
+    """Write a JPEG thumbnail of an image (runs on the worker pool)."""
+    # A unique temporary file, so two workers thumbnailing the same blob never share one
+    fd, partial_path = _create_temp_file(os.path.dirname(thumbnail_path))
+    try:
+        with os.fdopen(fd, 'wb') as partial_file:
+            with Image.open(source_path) as image:
+                image.draft('RGB', THUMBNAIL_SIZE)
+                image.thumbnail(THUMBNAIL_SIZE)
+                image.convert('RGB').save(partial_file, 'JPEG', quality=80)
+        os.replace(partial_path, thumbnail_path)
+    except Exception:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+
+
+def _remove_stale(path, cutoff):
+    """Delete a file last modified before cutoff. Returns its size, or None if it was kept."""
+    try:
+        stat = os.stat(path)
+        if stat.st_mtime >= cutoff:
+            return None
+        os.remove(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_size
+
+
+class BlobStore:
+    """Stores and serves immutable files by content hash."""
+
+    def __init__(self, root):
+        self.root = root
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def path_for(self, blob_hash):
+        """Get the path of a blob file."""
+        return os.path.join(self.root, blob_hash[:2], blob_hash[2:4], blob_hash)
+
+    def thumbnail_path_for(self, blob_hash):
+        """Get the path of a blob's thumbnail."""
+        return os.path.join(self.root, 'thumbnails', blob_hash[:2], blob_hash + '.jpg')
+
+    def exists(self, blob_hash):
+        """Check whether a blob is stored."""
+        return os.path.exists(self.path_for(blob_hash))
+
+    def has_thumbnail(self, blob_hash):
+        """Check whether a blob's thumbnail has been generated."""
+        return os.path.exists(self.thumbnail_path_for(blob_hash))
+
+    def write_stream(self, stream, max_size=None):
+        """
+        Store the contents of a binary stream, reading it CHUNK_SIZE bytes at a time.
+        Returns (blob_hash, size). Raises ValueError, storing nothing, if the stream is
+        empty or larger than max_size.
+        """
+        tmp_dir = os.path.join(self.root, 'tmp')
+        os.makedirs(tmp_dir, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = _create_temp_file(tmp_dir)
+        try:
+            with os.fdopen(fd, 'wb') as tmp_file:
+                while True:
+                    chunk = stream.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if max_size is not None and size > max_size:
+                        raise ValueError("File is larger than {} bytes".format(max_size))
+                    digest.update(chunk)
+                    tmp_file.write(chunk)
+                if size == 0:
+                    raise ValueError("File is empty")
+                tmp_file.flush()
+                os.fsync(tmp_file.fileno())
+            blob_hash = digest.hexdigest()
+            path = self.path_for(blob_hash)
+            try:
+                # Same content already stored: keep the existing file, and touch it so
+                # garbage collection treats it as a fresh upload until it is recorded
+                os.utime(path)
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                # Not stored, or just set aside by garbage collection: store this copy
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return blob_hash, size
+
+    def request_thumbnail(self, blob_hash, content_type):
+        """Queue thumbnail generation for an image blob. Returns False if none will be made."""
+        if Image is None or not content_type.startswith('image/') or self.has_thumbnail(blob_hash):
+            return False
+        thumbnail_path = self.thumbnail_path_for(blob_hash)
+        os.makedirs(os.path.dirname(thumbnail_path), exist_ok=True)
+        with self._executor_lock:
+            if self._executor is None:
+                # Pillow releases the GIL while decoding and resizing, so threads suffice
+                self._executor = ThreadPoolExecutor(max_workers=THUMBNAIL_WORKERS,
+                                                    thread_name_prefix='thumbnail')
+        future = self._executor.submit(_generate_thumbnail, self.path_for(blob_hash), thumbnail_path)
+
+        def report_failure(done):
+            if done.exception():
+                print("Thumbnail failed for {}: {}".format(blob_hash, done.exception()))
+        future.add_done_callback(report_failure)
+        return True
+
+    def collect_garbage(self, referenced_hashes, is_referenced, grace_seconds=DEFAULT_GC_GRACE_SECONDS):
+        """
+        Delete blobs that no attachment references, with their thumbnails, and leftover
+        temporary files. Files modified in the last grace_seconds are kept.
+        referenced_hashes is the set of hashes in use when collection starts;
+        is_referenced(blob_hash) is asked again for each blob just before it is deleted.
+        Returns counts of what was removed.
+        """
+        cutoff = time.time() - grace_seconds
+        stats = {'blobs_removed': 0, 'bytes_freed': 0, 'temp_files_removed': 0}
+        if not os.path.isdir(self.root):
+            return stats
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            if dirpath == self.root:
+                dirnames[:] = [name for name in dirnames if name not in ('tmp', 'thumbnails')]
+                continue
+            for name in filenames:
+                if name.endswith(TOMBSTONE_SUFFIX):
+                    # Left by an interrupted collection: put the blob back and judge it afresh
+                    name = name[:-len(TOMBSTONE_SUFFIX)]
+                    if BLOB_NAME.fullmatch(name):
+                        os.replace(os.path.join(dirpath, name + TOMBSTONE_SUFFIX), os.path.join(dirpath, name))
+                if not BLOB_NAME.fullmatch(name) or name in referenced_hashes:
+                    continue
+                size = self._collect_blob(name, cutoff, is_referenced)
+                if size is not None:
+                    stats['blobs_removed'] += 1
+                    stats['bytes_freed'] += size
+
+        # Temporary files left behind by interrupted uploads and thumbnails
+        temp_paths = []
+        for dirpath, _, filenames in os.walk(os.path.join(self.root, 'tmp')):
+            temp_paths.extend(os.path.join(dirpath, name) for name in filenames)
+        for dirpath, _, filenames in os.walk(os.path.join(self.root, 'thumbnails')):
+            temp_paths.extend(os.path.join(dirpath, name) for name in filenames if name.endswith('.part'))
+        for path in temp_paths:
+            size = _remove_stale(path, cutoff)
+            if size is not None:
+                stats['temp_files_removed'] += 1
+                stats['bytes_freed'] += size
+        return stats
+
+    def _collect_blob(self, blob_hash, cutoff, is_referenced):
+        """
+        Delete one unreferenced blob unless it was touched after cutoff. Returns its size,
+        or None if it was kept.
+        The blob is renamed aside first. An upload of the same content that touched it
+        before the rename shows in the mtime checked afterwards; one that comes later
+        finds no file and stores its own copy. Either way no upload is left without a file.
+        """
+        path = self.path_for(blob_hash)
+        tombstone = path + TOMBSTONE_SUFFIX
+        try:
+            if os.stat(path).st_mtime >= cutoff:
+                return None
+            os.replace(path, tombstone)
+            stat = os.stat(tombstone)
+            if stat.st_mtime >= cutoff or is_referenced(blob_hash):
+                os.replace(tombstone, path)
+                return None
+            os.remove(tombstone)
+        except FileNotFoundError:
+            return None  # Removed or set aside by another collection
+        except Exception:
+            if os.path.exists(tombstone):
+                os.replace(tombstone, path)
+            raise
+        if os.path.exists(path):
+            return None  # An upload stored a fresh copy meanwhile; it keeps its thumbnail
+        if self.has_thumbnail(blob_hash):
+            os.remove(self.thumbnail_path_for(blob_hash))
+        return stat.st_size
+
+
+_blob_store = None
+
+
+def get_blob_store():
+    """Get the app-wide blob store (LOCKER_BLOB_DIR, or backend/blobs)."""
+    global _blob_store
+    if _blob_store is None:
+        default = os.path.normpath(os.path.join(os.path.dirname(get_db_path()), 'blobs'))
+        _blob_store = BlobStore(os.environ.get('LOCKER_BLOB_DIR') or default)
+    return _blob_store
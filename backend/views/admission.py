@@ -0,0 +1,202 @@
+"""
+Request admission control for the API.
+
+Two layers protect the database from overload:
+- A token-bucket rate limiter keyed by client address, applied to every /api request.
+  Over-limit requests get 429 with Retry-After.
+- Concurrency limiters in front of expensive routes. A few requests run at once,
+  a few more wait briefly in a queue, and the rest get 503 with Retry-After
+  instead of piling up behind SQLite. Long-running transfers (import, export,
+  attachment uploads and downloads) hold their slot for the whole transfer, so
+  they have their own limiter and cannot starve short queries such as asset
+  listings.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, request, jsonify, make_response
+
+
+class InMemoryBucketStore:
+    """
+    Token buckets held in process memory, at most max_keys of them; the least
+    recently used bucket is evicted when a new key would exceed that.
+    Any object with the same take() method can be used instead, e.g. one backed
+    by a shared store so several app processes enforce a common limit.
+    """
+
+    def __init__(self, max_keys=10000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, rate, capacity, cost=1):
+        """
+        Take `cost` tokens from the bucket for `key`, refilling at `rate` tokens
+        per second up to `capacity`. Returns (allowed, retry_after_seconds).
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            if tokens >= cost:
+                self._buckets[key] = (tokens - cost, now)
+                allowed, retry_after = True, 0.0
+            else:
+                self._buckets[key] = (tokens, now)
+                allowed, retry_after = False, (cost - tokens) / rate
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, retry_after
+
+
+class RateLimiter:
+    """
+    Token-bucket rate limiter applied to every /api request.
+    Callers are told apart by client address; pass key_func to key on an
+    authenticated identity instead. Request headers are never trusted for this,
+    since a client could pick a fresh key per request or spend another's bucket.
+    """
+
+    def __init__(self, store=None, key_func=None):
+        self.store = store or InMemoryBucketStore()
+        self.key_func = key_func or self.client_key
+
+    def init_app(self, app):
+        """Set default limits in app config and install the before_request check."""
+        app.config.setdefault('RATE_LIMIT_ENABLED', True)
+        app.config.setdefault('RATE_LIMIT_PER_SECOND', 10.0)
+        app.config.setdefault('RATE_LIMIT_BURST', 20)
+        app.before_request(self.check)
+
+    @staticmethod
+    def client_key():
+        """Identify the caller by remote address (behind a proxy, apply ProxyFix so it is the client's)."""
+        return 'ip:' + (request.remote_addr or 'unknown')
+
+    def check(self):
+        """
+        Reject the request with 429 if the caller's bucket is empty (limits are read from app config).
+        A RATE_LIMIT_PER_SECOND of 0 or less turns the limiter off, like RATE_LIMIT_ENABLED=False.
+        """
+        config = current_app.config
+        rate = float(config['RATE_LIMIT_PER_SECOND'])
+        if not config['RATE_LIMIT_ENABLED'] or rate <= 0:
+            return None
+        if not request.path.startswith('/api/') or request.method == 'OPTIONS':
+            return None
+        allowed, retry_after = self.store.take(self.key_func(), rate, int(config['RATE_LIMIT_BURST']))
+        if allowed:
+            return None
+        response = jsonify({'error': 'Too many requests'})
+        response.status_code = 429
+        response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+        return response
+
+
+class ConcurrencyLimiter:
+    """
+    Caps how many requests run a group of routes at once, with a short bounded queue.
+    Limits are read from app config keys starting with config_prefix on every
+    request; the constructor arguments are their defaults.
+    """
+
+    def __init__(self, config_prefix='CONCURRENCY', max_concurrent=4, max_queue=8,
+                 queue_timeout=2.0, retry_after=1):
+        self.config_prefix = config_prefix
+        self.defaults = {
+            'LIMIT': max_concurrent,
+            'QUEUE': max_queue,
+            'QUEUE_TIMEOUT': queue_timeout,
+            'RETRY_AFTER': retry_after,
+        }
+        self._condition = threading.Condition()
+        self._waiting = 0
+        self._active = 0
+
+    def init_app(self, app):
+        """Set default limits in app config."""
+        for name, value in self.defaults.items():
+            app.config.setdefault(self.config_prefix + '_' + name, value)
+
+    def _setting(self, name):
+        """Read one limit from the current app's config."""
+        return current_app.config.get(self.config_prefix + '_' + name, self.defaults[name])
+
+    def status(self):
+        """Get the number of running and queued requests."""
+        with self._condition:
+            return {'active': self._active, 'waiting': self._waiting}
+
+    def _acquire(self):
+        """Get a slot, waiting in the queue if there is room. Returns False to shed the request."""
+        max_concurrent = int(self._setting('LIMIT'))
+        with self._condition:
+            if self._active < max_concurrent:
+                self._active += 1
+                return True
+            if self._waiting >= int(self._setting('QUEUE')):
+                return False
+            self._waiting += 1
+            try:
+                acquired = self._condition.wait_for(lambda: self._active < max_concurrent,
+                                                    timeout=float(self._setting('QUEUE_TIMEOUT')))
+            finally:
+                self._waiting -= 1
+            if acquired:
+                self._active += 1
+            return acquired
+
+    def _release(self):
+        """Give a slot back."""
+        with self._condition:
+            self._active -= 1
+            self._condition.notify()
+
+    def _overloaded(self):
+        """Build the 503 response for a shed request."""
+        response = jsonify({'error': 'Server is busy, please retry'})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(max(1, math.ceil(float(self._setting('RETRY_AFTER')))))
+        return response
+
+    def limit(self, view):
+        """Decorator that runs a view under the concurrency limit."""
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not self._acquire():
+                return self._overloaded()
+            handed_off = False
+            try:
+                response = make_response(view(*args, **kwargs))
+                if response.is_streamed:
+                    # Keep the slot until the body has been sent
+                    response.call_on_close(self._release)
+                    handed_off = True
+                return response
+            finally:
+                if not handed_off:
+                    self._release()
+        return wrapper
+
+
+rate_limiter = RateLimiter()
+expensive_route_limiter = ConcurrencyLimiter()
+transfer_route_limiter = ConcurrencyLimiter('TRANSFER_CONCURRENCY', max_concurrent=4, max_queue=4,
+                                            queue_timeout=2.0, retry_after=5)
+
+
+def init_admission(app, store=None):
+    """
+    Install rate limiting and set default limits in app config.
+    `store` replaces the in-memory bucket store, e.g. with one shared by several processes.
+    """
+    if store is not None:
+        rate_limiter.store = store
+    rate_limiter.init_app(app)
+    expensive_route_limiter.init_app(app)
+    transfer_route_limiter.init_app(app)
@@ -3,15 +3,22 @@ Asset API routes/views.
 """
 from flask import Blueprint, request, jsonify
 from backend.presenters.asset_service import AssetService
+from backend.views.admission import expensive_route_limiter
 
 asset_bp = Blueprint('asset', __name__)
 
 
 @asset_bp.route('/api/lockers/<int:locker_id>/assets', methods=['GET'])
+@expensive_route_limiter.limit
 def get_assets_by_locker(locker_id):
-    """Get all assets for a specific locker."""
+    """Get all assets for a specific locker (?format=compact for columnar JSON)."""
     try:
+        listing_format = request.args.get('format', 'full')
+        if listing_format not in ('full', 'compact'):
+            return jsonify({'error': 'format must be full or compact'}), 400
         assets = AssetService.get_assets_by_locker(locker_id)
+        if listing_format == 'compact':
+            return jsonify(AssetService.to_compact(assets)), 200
         return jsonify(assets), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -0,0 +1,93 @@
+"""
+Attachment API routes/views.
+
+Uploads are sent as the raw request body and streamed to the blob store in
+chunks. Downloads go through send_file, which answers Range and conditional
+requests and lets the WSGI server use sendfile (or X-Sendfile when
+USE_X_SENDFILE is set) instead of copying the file through Python.
+"""
+from flask import Blueprint, request, jsonify, send_file
+from backend.presenters.attachment_service import AttachmentService
+from backend.views.admission import transfer_route_limiter
+
+attachment_bp = Blueprint('attachment', __name__)
+
+
+@attachment_bp.route('/api/assets/<int:asset_id>/attachments', methods=['GET'])
+def get_attachments(asset_id):
+    """Get all attachments of an asset."""
+    try:
+        return jsonify(AttachmentService.get_attachments(asset_id)), 200
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@attachment_bp.route('/api/assets/<int:asset_id>/attachments', methods=['POST'])
+@transfer_route_limiter.limit
+def upload_attachment(asset_id):
+    """Upload a file as the raw request body; name it with X-Filename or ?filename=."""
+    try:
+        filename = request.headers.get('X-Filename') or request.args.get('filename')
+        attachment = AttachmentService.upload(asset_id, request.stream, filename, request.content_type)
+        return jsonify(attachment), 201
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 404
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@attachment_bp.route('/api/attachments/<int:attachment_id>', methods=['GET'])
+def get_attachment(attachment_id):
+    """Get an attachment's metadata."""
+    try:
+        return jsonify(AttachmentService.get_attachment(attachment_id)), 200
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@attachment_bp.route('/api/attachments/<int:attachment_id>/content', methods=['GET'])
+@transfer_route_limiter.limit
+def download_attachment(attachment_id):
+    """Download an attachment (supports Range requests; ?download=1 saves it as a file)."""
+    try:
+        attachment, path = AttachmentService.get_content_path(attachment_id)
+        # Blobs never change, so their hash is a strong ETag and they can be cached for long
+        return send_file(path, mimetype=attachment['content_type'],
+                         as_attachment=request.args.get('download') == '1',
+                         download_name=attachment['filename'],
+                         conditional=True, etag=attachment['blob_hash'], max_age=86400)
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@attachment_bp.route('/api/attachments/<int:attachment_id>/thumbnail', methods=['GET'])
+def get_thumbnail(attachment_id):
+    """Get the JPEG thumbnail of an image attachment."""
+    try:
+        attachment, path = AttachmentService.get_thumbnail_path(attachment_id)
+        return send_file(path, mimetype='image/jpeg', conditional=True,
+                         etag=attachment['blob_hash'] + '-thumb', max_age=86400)
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@attachment_bp.route('/api/attachments/<int:attachment_id>', methods=['DELETE'])
+def delete_attachment(attachment_id):
+    """Delete an attachment."""
+    try:
+        AttachmentService.delete_attachment(attachment_id)
+        return jsonify({'message': 'Attachment deleted successfully'}), 200
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
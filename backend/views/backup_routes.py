@@ -0,0 +1,34 @@
+"""
+Backup and snapshot API routes/views.
+"""
+import threading
+
+from flask import Blueprint, jsonify
+from backend.database.backup import get_snapshot_manager, get_backup_status
+
+backup_bp = Blueprint('backup', __name__)
+
+
+@backup_bp.route('/api/backups', methods=['GET'])
+def get_backups():
+    """Get snapshots plus backup progress and throughput metrics."""
+    try:
+        return jsonify(get_snapshot_manager().status()), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@backup_bp.route('/api/backups', methods=['POST'])
+def create_snapshot():
+    """Start a snapshot in the background; poll GET /api/backups for progress."""
+    if get_backup_status()['running']:
+        return jsonify({'error': 'A backup is already running'}), 409
+
+    def run():
+        try:
+            get_snapshot_manager().take_snapshot()
+        except Exception as e:
+            print("Snapshot failed: {}".format(e))
+
+    threading.Thread(target=run, name='snapshot', daemon=True).start()
+    return jsonify({'message': 'Snapshot started'}), 202
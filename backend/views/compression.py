@@ -0,0 +1,74 @@
+"""
+Negotiated response compression for the API.
+Responses above a size threshold are compressed with brotli (when the optional
+`brotli` package is installed) or gzip, depending on the client's Accept-Encoding.
+"""
+import gzip
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+
+COMPRESSIBLE_MIMETYPES = ('application/json', 'application/x-ndjson', 'text/csv',
+                          'text/html', 'text/plain')
+
+
+class Compressor:
+    """Compresses eligible responses in an after_request hook; settings are read from app config."""
+
+    def init_app(self, app):
+        """Set default settings in app config and install the after_request hook."""
+        app.config.setdefault('COMPRESS_ENABLED', True)
+        app.config.setdefault('COMPRESS_MIN_SIZE', 500)
+        app.config.setdefault('COMPRESS_GZIP_LEVEL', 6)
+        app.config.setdefault('COMPRESS_BROTLI_QUALITY', 4)
+        # Never pretty-print JSON, even in debug mode
+        app.json.compact = True
+        app.after_request(self.compress)
+
+    @staticmethod
+    def choose_encoding():
+        """Pick the best encoding the client accepts, or None."""
+        accepted = request.accept_encodings
+        gzip_quality = accepted.quality('gzip')
+        brotli_quality = accepted.quality('br') if brotli else 0
+        if brotli_quality and brotli_quality >= gzip_quality:
+            return 'br'
+        if gzip_quality:
+            return 'gzip'
+        return None
+
+    def compress(self, response):
+        """Compress the response body if it is eligible and the client accepts it."""
+        config = current_app.config
+        if not config['COMPRESS_ENABLED'] or response.mimetype not in COMPRESSIBLE_MIMETYPES:
+            return response
+        response.vary.add('Accept-Encoding')
+        # Streams and file responses are sent as they are
+        if (response.direct_passthrough or response.is_streamed
+                or 'Content-Encoding' in response.headers
+                or response.status_code < 200 or response.status_code in (204, 304)):
+            return response
+        if (response.content_length or 0) < int(config['COMPRESS_MIN_SIZE']):
+            return response
+        encoding = self.choose_encoding()
+        if not encoding:
+            return response
+
+        data = response.get_data()
+        if encoding == 'br':
+            compressed = brotli.compress(data, quality=int(config['COMPRESS_BROTLI_QUALITY']))
+        else:
+            compressed = gzip.compress(data, compresslevel=int(config['COMPRESS_GZIP_LEVEL']))
+        if len(compressed) >= len(data):
+            return response
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+
+compressor = Compressor()
@@ -0,0 +1,53 @@
+"""
+Read replica API routes/views and read-your-writes tracking.
+
+After a request writes, the response carries the new replication version in
+the X-Locker-Version header and a cookie. Clients that send it back are only
+served by replicas that already contain their writes. Clients that send
+neither may have written without keeping the version, so they read from the
+primary; the bundled frontend always sends the header (0 before its first write).
+"""
+from flask import Blueprint, request, jsonify
+from backend.models.repository import get_repository, get_read_version, set_read_version
+
+replica_bp = Blueprint('replica', __name__)
+
+VERSION_HEADER = 'X-Locker-Version'
+VERSION_COOKIE = 'locker_version'
+
+
+def _client_version():
+    """Get the replication version the client last saw, from header or cookie, or None if it sent neither."""
+    value = request.headers.get(VERSION_HEADER) or request.cookies.get(VERSION_COOKIE)
+    try:
+        return max(0, int(value)) if value else None
+    except ValueError:
+        return None
+
+
+@replica_bp.before_app_request
+def load_read_version():
+    """Start each request with the version the client has already seen."""
+    set_read_version(_client_version())
+
+
+@replica_bp.after_app_request
+def save_read_version(response):
+    """Hand the version back to the client if this request moved it forward."""
+    version = get_read_version()
+    if version is not None and version > (_client_version() or 0):
+        response.headers[VERSION_HEADER] = str(version)
+        response.set_cookie(VERSION_COOKIE, str(version), httponly=True, samesite='Lax')
+    return response
+
+
+@replica_bp.route('/api/replicas', methods=['GET'])
+def get_replicas():
+    """Get replica lag metrics."""
+    try:
+        replicas = getattr(get_repository(), 'replicas', None)
+        if not replicas:
+            return jsonify({'replicas': []}), 200
+        return jsonify(replicas.status()), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
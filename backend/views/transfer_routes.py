@@ -0,0 +1,55 @@
+"""
+Bulk import/export API routes/views.
+"""
+from flask import Blueprint, request, jsonify, Response, stream_with_context
+from backend.presenters.transfer_service import TransferService, DEFAULT_CHUNK_SIZE
+from backend.views.admission import transfer_route_limiter
+
+transfer_bp = Blueprint('transfer', __name__)
+
+MIMETYPES = {'csv': 'text/csv', 'jsonl': 'application/x-ndjson'}
+
+
+def _request_lines():
+    """Decode the request body line by line without buffering it whole."""
+    for line in request.stream:
+        yield line.decode('utf-8')
+
+
+@transfer_bp.route('/api/import/<entity>', methods=['POST'])
+@transfer_route_limiter.limit
+def import_records(entity):
+    """Import lockers or assets from a CSV/JSONL request body."""
+    try:
+        fmt = request.args.get('format', 'jsonl')
+        chunk_size = request.args.get('chunk_size', DEFAULT_CHUNK_SIZE, type=int)
+        stats = TransferService.import_records(entity, _request_lines(), fmt, chunk_size=chunk_size)
+        return jsonify(stats), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@transfer_bp.route('/api/export/<entity>', methods=['GET'])
+@transfer_route_limiter.limit
+def export_records(entity):
+    """Stream all lockers or assets as CSV/JSONL."""
+    fmt = request.args.get('format', 'jsonl')
+    include_deleted = request.args.get('include_deleted', 'false').lower() in ('1', 'true', 'yes')
+    try:
+        chunks = TransferService.export_records(entity, fmt, include_deleted=include_deleted)
+        # Run the argument checks now so a bad request gets a 400 instead of a broken stream
+        first = next(chunks, '')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+    def generate():
+        yield first
+        yield from chunks
+
+    response = Response(stream_with_context(generate()), mimetype=MIMETYPES[fmt])
+    response.headers['Content-Disposition'] = 'attachment; filename={}.{}'.format(entity, fmt)
+    return response
@@ -0,0 +1,76 @@
+"""
+Valuation API routes/views.
+"""
+from flask import Blueprint, request, jsonify
+from backend.presenters.valuation_service import ValuationService
+from backend.views.admission import expensive_route_limiter
+
+valuation_bp = Blueprint('valuation', __name__)
+
+
+@valuation_bp.route('/api/lockers/<int:locker_id>/valuation', methods=['GET'])
+@expensive_route_limiter.limit
+def get_locker_valuation(locker_id):
+    """Get a locker's daily portfolio value between ?from= and ?to= (YYYY-MM-DD)."""
+    try:
+        valuation = ValuationService.get_locker_valuation(
+            locker_id, request.args.get('from'), request.args.get('to'))
+        return jsonify(valuation), 200
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 404
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@valuation_bp.route('/api/orgs/<int:org_id>/valuation', methods=['GET'])
+@expensive_route_limiter.limit
+def get_org_valuation(org_id):
+    """Get an org's daily portfolio value between ?from= and ?to= (YYYY-MM-DD)."""
+    try:
+        valuation = ValuationService.get_org_valuation(
+            org_id, request.args.get('from'), request.args.get('to'))
+        return jsonify(valuation), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@valuation_bp.route('/api/assets/<int:asset_id>/valuations', methods=['GET'])
+def get_asset_valuations(asset_id):
+    """Get the valuation history of an asset."""
+    try:
+        return jsonify(ValuationService.get_asset_history(asset_id)), 200
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@valuation_bp.route('/api/assets/<int:asset_id>/valuations', methods=['POST'])
+def record_asset_valuation(asset_id):
+    """Record a new value for an asset."""
+    try:
+        data = request.get_json()
+        return jsonify(ValuationService.record_valuation(asset_id, data)), 201
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 404
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@valuation_bp.route('/api/valuations/revalue', methods=['POST'])
+@expensive_route_limiter.limit
+def bulk_revalue():
+    """Revalue all matching assets, e.g. apply a gold price change to JEWELLERY."""
+    try:
+        data = request.get_json()
+        return jsonify(ValuationService.bulk_revalue(data)), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
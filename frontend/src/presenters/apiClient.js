@@ -0,0 +1,29 @@
+/**
+ * Shared fetch wrapper for API calls.
+ *
+ * After a write the server returns the database version that contains it in
+ * the X-Locker-Version header. The highest version seen is kept in
+ * localStorage and sent with every request, so reads are only served by
+ * read replicas that already include this browser's writes.
+ */
+const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:5000';
+
+const VERSION_HEADER = 'X-Locker-Version';
+const VERSION_STORAGE_KEY = 'lockerVersion';
+
+function getVersion() {
+  return Number(window.localStorage.getItem(VERSION_STORAGE_KEY)) || 0;
+}
+
+/**
+ * Fetch an API path, sending and recording the replication version.
+ */
+export async function apiFetch(path, options = {}) {
+  const headers = { ...(options.headers || {}), [VERSION_HEADER]: String(getVersion()) };
+  const response = await fetch(`${API_BASE_URL}${path}`, { ...options, headers });
+  const version = Number(response.headers.get(VERSION_HEADER));
+  if (version > getVersion()) {
+    window.localStorage.setItem(VERSION_STORAGE_KEY, String(version));
+  }
+  return response;
+}
@@ -2,8 +2,7 @@
  * Asset service for API calls.
  */
 import Asset from '../models/Asset';
-
-const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:5000';
+import { apiFetch } from './apiClient';
 
 class AssetService {
   /**
@@ -11,7 +10,7 @@ class AssetService {
    */
   static async getAssetsByLocker(lockerId) {
     try {
-      const response = await fetch(`${API_BASE_URL}/api/lockers/${lockerId}/assets`);
+      const response = await apiFetch(`/api/lockers/${lockerId}/assets`);
       if (!response.ok) {
         throw new Error('Failed to fetch assets');
       }
@@ -28,7 +27,7 @@ class AssetService {
    */
   static async createAsset(lockerId, assetData) {
     try {
-      const response = await fetch(`${API_BASE_URL}/api/lockers/${lockerId}/assets`, {
+      const response = await apiFetch(`/api/lockers/${lockerId}/assets`, {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
@@ -52,7 +51,7 @@ class AssetService {
    */
   static async updateAsset(assetId, assetData) {
     try {
-      const response = await fetch(`${API_BASE_URL}/api/assets/${assetId}`, {
+      const response = await apiFetch(`/api/assets/${assetId}`, {
         method: 'PUT',
         headers: {
           'Content-Type': 'application/json',
@@ -76,7 +75,7 @@ class AssetService {
    */
   static async deleteAsset(assetId) {
     try {
-      const response = await fetch(`${API_BASE_URL}/api/assets/${assetId}`, {
+      const response = await apiFetch(`/api/assets/${assetId}`, {
         method: 'DELETE',
       });
       if (!response.ok) {
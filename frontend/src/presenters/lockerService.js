@@ -2,8 +2,7 @@
  * Locker service for API calls.
  */
 import Locker from '../models/Locker';
-
-const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:5000';
+import { apiFetch } from './apiClient';
 
 class LockerService {
   /**
@@ -11,7 +10,7 @@ class LockerService {
    */
   static async getAllLockers() {
     try {
-      const response = await fetch(`${API_BASE_URL}/api/lockers`);
+      const response = await apiFetch(`/api/lockers`);
       if (!response.ok) {
         throw new Error('Failed to fetch lockers');
       }
@@ -28,7 +27,7 @@ class LockerService {
    */
   static async getLockerById(lockerId) {
     try {
-      const response = await fetch(`${API_BASE_URL}/api/lockers/${lockerId}`);
+      const response = await apiFetch(`/api/lockers/${lockerId}`);
       if (!response.ok) {
         throw new Error('Failed to fetch locker');
       }
@@ -45,7 +44,7 @@ class LockerService {
    */
   static async createLocker(lockerData) {
     try {
-      const response = await fetch(`${API_BASE_URL}/api/lockers`, {
+      const response = await apiFetch(`/api/lockers`, {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
@@ -69,7 +68,7 @@ class LockerService {
    */
   static async updateLocker(lockerId, lockerData) {
     try {
-      const response = await fetch(`${API_BASE_URL}/api/lockers/${lockerId}`, {
+      const response = await apiFetch(`/api/lockers/${lockerId}`, {
         method: 'PUT',
         headers: {
           'Content-Type': 'application/json',
@@ -93,7 +92,7 @@ class LockerService {
    */
   static async deleteLocker(lockerId) {
     try {
-      const response = await fetch(`${API_BASE_URL}/api/lockers/${lockerId}`, {
+      const response = await apiFetch(`/api/lockers/${lockerId}`, {
         method: 'DELETE',
       });
       if (!response.ok) {
@@ -0,0 +1,112 @@
+"""
+Rate limiting (429) and concurrency limiting with queueing (503).
+"""
+import threading
+import time
+
+import pytest
+from flask import Flask
+
+from backend.views import admission
+from backend.views.admission import ConcurrencyLimiter, InMemoryBucketStore
+
+
+@pytest.fixture
+def limited(client, monkeypatch):
+    """The app client with rate limiting on and an empty bucket store."""
+    monkeypatch.setattr(admission.rate_limiter, 'store', InMemoryBucketStore())
+    client.application.config.update(RATE_LIMIT_ENABLED=True, RATE_LIMIT_PER_SECOND=0.01, RATE_LIMIT_BURST=2)
+    return client
+
+
+def test_rate_limit_returns_429_with_retry_after(repository, limited):
+    assert [limited.get('/api/lockers').status_code for _ in range(2)] == [200, 200]
+    response = limited.get('/api/lockers')
+    assert response.status_code == 429
+    assert response.headers['Retry-After'] == '100'
+    # Only /api routes are limited
+    assert limited.get('/').status_code == 200
+
+
+def test_client_headers_do_not_pick_the_bucket(repository, limited):
+    statuses = [limited.get('/api/lockers', headers={'X-Client-Id': str(n)}).status_code for n in range(3)]
+    assert statuses == [200, 200, 429]
+
+
+def test_zero_rate_turns_the_limiter_off(repository, limited):
+    limited.application.config['RATE_LIMIT_PER_SECOND'] = 0
+    assert {limited.get('/api/lockers').status_code for _ in range(5)} == {200}
+
+
+def test_bucket_store_evicts_least_recently_used():
+    store = InMemoryBucketStore(max_keys=2)
+    store.take('a', rate=1, capacity=1)
+    store.take('b', rate=1, capacity=1)
+    store.take('a', rate=1, capacity=1)
+    store.take('c', rate=1, capacity=1)
+    assert list(store._buckets) == ['a', 'c']
+
+
+@pytest.fixture
+def slow_app():
+    """An app with one route under a 1-running, 1-queued limit that blocks until released."""
+    app = Flask(__name__)
+    limiter = ConcurrencyLimiter('TEST_CONCURRENCY', max_concurrent=1, max_queue=1,
+                                 queue_timeout=5.0, retry_after=0.5)
+    limiter.init_app(app)
+    started = threading.Semaphore(0)
+    release = threading.Event()
+
+    @app.route('/slow')
+    @limiter.limit
+    def slow():
+        started.release()
+        release.wait(5)
+        return 'done'
+
+    app.limiter, app.started, app.release = limiter, started, release
+    yield app
+    release.set()
+
+
+def _get_in_thread(app, results):
+    thread = threading.Thread(target=lambda: results.append(app.test_client().get('/slow').status_code))
+    thread.start()
+    return thread
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_concurrency_limit_queues_then_sheds(slow_app):
+    results = []
+    running = _get_in_thread(slow_app, results)
+    assert slow_app.started.acquire(timeout=5)
+    queued = _get_in_thread(slow_app, results)
+    _wait_for(lambda: slow_app.limiter.status()['waiting'] == 1)
+
+    # Slot and queue are full: shed at once, with a whole-second Retry-After
+    response = slow_app.test_client().get('/slow')
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+
+    slow_app.release.set()
+    running.join(5)
+    queued.join(5)
+    assert results == [200, 200]
+    assert slow_app.limiter.status() == {'active': 0, 'waiting': 0}
+
+
+def test_queued_request_times_out(slow_app):
+    slow_app.config['TEST_CONCURRENCY_QUEUE_TIMEOUT'] = 0.05
+    results = []
+    running = _get_in_thread(slow_app, results)
+    assert slow_app.started.acquire(timeout=5)
+    assert slow_app.test_client().get('/slow').status_code == 503
+    slow_app.release.set()
+    running.join(5)
+    assert results == [200]
+    assert slow_app.limiter.status() == {'active': 0, 'waiting': 0}
@@ -0,0 +1,129 @@
+"""
+Attachment uploads and blob garbage collection.
+"""
+import io
+import os
+import time
+
+import pytest
+
+from backend.presenters.asset_service import AssetService
+from backend.presenters.attachment_service import AttachmentService
+from backend.presenters.locker_service import LockerService
+from backend.storage import blob_store as blob_store_module
+from backend.storage.blob_store import BlobStore
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """Point the app at an empty blob store."""
+    store = BlobStore(str(tmp_path / 'blobs'))
+    monkeypatch.setattr(blob_store_module, '_blob_store', store)
+    return store
+
+
+def _create_asset():
+    locker = LockerService.create_locker({'name': 'Home safe', 'location_name': 'Bedroom', 'address': '1 Main St'})
+    return AssetService.create_asset(locker['id'], {'name': 'Deed', 'asset_type': 'DOCUMENT'})
+
+
+def _upload(asset_id, content):
+    return AttachmentService.upload(asset_id, io.BytesIO(content), 'deed.pdf', 'application/pdf')
+
+
+def _age(path, seconds):
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+def _files(root):
+    return sorted(name for _, _, names in os.walk(root) for name in names)
+
+
+def test_rejected_uploads_store_nothing(repository, store):
+    asset = _create_asset()
+    with pytest.raises(ValueError):
+        _upload(asset['id'], b'')
+    with pytest.raises(ValueError):
+        store.write_stream(io.BytesIO(b'x' * 10), max_size=5)
+    assert _files(store.root) == []
+
+
+def test_garbage_collection_keeps_referenced_and_recent_blobs(repository, store):
+    asset = _create_asset()
+    kept = _upload(asset['id'], b'kept')
+    deleted = _upload(asset['id'], b'deleted')
+    AttachmentService.delete_attachment(deleted['id'])
+    orphan_hash, _ = store.write_stream(io.BytesIO(b'upload whose record failed'))
+
+    # Within the grace period nothing is removed
+    assert AttachmentService.collect_garbage()['blobs_removed'] == 0
+
+    for blob_hash in (kept['blob_hash'], deleted['blob_hash'], orphan_hash):
+        _age(store.path_for(blob_hash), 7200)
+    stats = AttachmentService.collect_garbage(grace_seconds=3600)
+    assert stats['blobs_removed'] == 2
+    assert store.exists(kept['blob_hash'])
+    assert not store.exists(deleted['blob_hash'])
+    assert not store.exists(orphan_hash)
+
+
+def test_reupload_of_unreferenced_blob_survives_collection(repository, store):
+    asset = _create_asset()
+    first = _upload(asset['id'], b'same')
+    AttachmentService.delete_attachment(first['id'])
+    _age(store.path_for(first['blob_hash']), 7200)
+
+    # Storing the same content again refreshes the file before its attachment is recorded
+    store.write_stream(io.BytesIO(b'same'))
+    assert AttachmentService.collect_garbage(grace_seconds=3600)['blobs_removed'] == 0
+    assert store.exists(first['blob_hash'])
+
+
+def test_stored_files_follow_the_umask(store):
+    previous = os.umask(0o022)
+    try:
+        blob_hash, _ = store.write_stream(io.BytesIO(b'shared with the web server'))
+    finally:
+        os.umask(previous)
+    assert os.stat(store.path_for(blob_hash)).st_mode & 0o777 == 0o644
+
+
+def test_collection_keeps_a_blob_reuploaded_while_it_is_checked(store):
+    blob_hash, _ = store.write_stream(io.BytesIO(b'same'))
+    _age(store.path_for(blob_hash), 7200)
+
+    def upload_during_check(checked_hash):
+        # The blob is set aside at this point; the upload stores its own copy
+        assert not store.exists(checked_hash)
+        assert store.write_stream(io.BytesIO(b'same'))[0] == checked_hash
+        return False
+
+    stats = store.collect_garbage(set(), upload_during_check, grace_seconds=3600)
+    assert stats['blobs_removed'] == 0
+    assert store.exists(blob_hash)
+
+
+def test_collection_rechecks_references(store):
+    blob_hash, _ = store.write_stream(io.BytesIO(b'recorded after the walk started'))
+    _age(store.path_for(blob_hash), 7200)
+    stats = store.collect_garbage(set(), lambda checked_hash: True, grace_seconds=3600)
+    assert stats['blobs_removed'] == 0
+    assert store.exists(blob_hash)
+
+
+def test_collection_restores_blobs_set_aside_by_an_interrupted_run(store):
+    blob_hash, _ = store.write_stream(io.BytesIO(b'kept'))
+    path = store.path_for(blob_hash)
+    os.replace(path, path + '.gc')
+    store.collect_garbage({blob_hash}, lambda checked_hash: True)
+    assert store.exists(blob_hash) and not os.path.exists(path + '.gc')
+
+
+def test_downloads_are_concurrency_limited(repository, store, client):
+    asset = _create_asset()
+    attachment = _upload(asset['id'], b'%PDF-1.4')
+    url = '/api/attachments/{}/content'.format(attachment['id'])
+    assert client.get(url).data == b'%PDF-1.4'
+    client.application.config.update(TRANSFER_CONCURRENCY_LIMIT=0, TRANSFER_CONCURRENCY_QUEUE=0)
+    assert client.get(url).status_code == 503
@@ -0,0 +1,122 @@
+"""
+Online backup, verification, restore and snapshot retention.
+"""
+import sqlite3
+import threading
+
+import pytest
+
+from backend.database.backup import (SnapshotManager, backup_database, get_backup_status,
+                                     restore_database, verify_backup)
+from backend.database.db_setup import get_connection
+from backend.database.replicas import read_version
+from backend.presenters.locker_service import LockerService
+
+
+def _create_locker(name):
+    return LockerService.create_locker({'name': name, 'location_name': 'Bank', 'address': '1 Main St'})
+
+
+def _names():
+    return sorted(locker['name'] for locker in LockerService.get_all_lockers())
+
+
+def _count_lockers(path):
+    conn = sqlite3.connect(str(path))
+    try:
+        return conn.execute('SELECT COUNT(*) FROM Locker').fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_backup_is_a_self_contained_copy(sqlite_file, tmp_path):
+    _create_locker('A')
+    completed = get_backup_status()['backups_completed']
+    path = tmp_path / 'copy.db'
+    result = backup_database(str(path))
+
+    assert result['path'] == str(path) and result['pages'] > 0
+    assert _count_lockers(path) == 1
+    conn = sqlite3.connect(str(path))
+    assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'delete'
+    conn.close()
+    assert not (tmp_path / 'copy.db.part').exists()
+    assert verify_backup(str(path)) == (True, ['ok'])
+    status = get_backup_status()
+    assert status['backups_completed'] == completed + 1 and not status['running']
+
+
+def test_stepped_backup_finishes_under_writes(sqlite_file, tmp_path):
+    for number in range(200):
+        _create_locker('Locker {}'.format(number) * 20)
+    stop = threading.Event()
+
+    def write():
+        while not stop.is_set():
+            _create_locker('Concurrent')
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    try:
+        backup_database(str(tmp_path / 'copy.db'), pages=1, pause=0.001)
+    finally:
+        stop.set()
+        writer.join()
+    assert verify_backup(str(tmp_path / 'copy.db'))[0]
+    assert _count_lockers(tmp_path / 'copy.db') >= 200
+
+
+def test_backup_rejects_bad_page_counts(sqlite_file, tmp_path):
+    for pages in (0, -2):
+        with pytest.raises(ValueError):
+            backup_database(str(tmp_path / 'copy.db'), pages=pages)
+
+
+def test_verify_reports_a_damaged_file(tmp_path):
+    path = tmp_path / 'damaged.db'
+    path.write_bytes(b'not a database' * 100)
+    ok, messages = verify_backup(str(path))
+    assert not ok and messages
+    with pytest.raises(ValueError):
+        verify_backup(str(tmp_path / 'missing.db'))
+
+
+def test_restore_replaces_data_and_moves_the_version_forward(sqlite_file, tmp_path):
+    _create_locker('A')
+    backup_database(str(tmp_path / 'copy.db'))
+    _create_locker('B')
+    conn = get_connection()
+    before = read_version(conn)
+    conn.close()
+
+    restore_database(str(tmp_path / 'copy.db'))
+    assert _names() == ['A']
+    conn = get_connection()
+    assert read_version(conn) > before
+    assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+    conn.close()
+    # The restored database takes writes as usual
+    _create_locker('C')
+    assert _names() == ['A', 'C']
+
+
+def test_restore_refuses_a_damaged_file(sqlite_file, tmp_path):
+    _create_locker('A')
+    path = tmp_path / 'damaged.db'
+    path.write_bytes(b'not a database' * 100)
+    with pytest.raises(ValueError):
+        restore_database(str(path))
+    assert _names() == ['A']
+
+
+def test_snapshots_taken_back_to_back_are_kept_apart(sqlite_file, tmp_path):
+    manager = SnapshotManager(str(tmp_path / 'snapshots'), keep=2, verify=False)
+    for name in ('A', 'B', 'C'):
+        _create_locker(name)
+        manager.take_snapshot()
+
+    snapshots = manager.list_snapshots()
+    assert len(snapshots) == 2
+    # Newest first: the last snapshot has all three lockers
+    assert [_count_lockers(path) for path in snapshots] == [3, 2]
+    assert manager.status()['keep'] == 2
@@ -0,0 +1,78 @@
+"""
+Response compression negotiation and the compact asset listing over HTTP.
+"""
+import gzip
+import json
+
+import pytest
+
+from backend.presenters.locker_service import LockerService
+from backend.views import compression
+
+
+@pytest.fixture
+def lockers(repository):
+    """Enough lockers that GET /api/lockers is well over the default size threshold."""
+    for number in range(30):
+        LockerService.create_locker({'name': 'Locker {}'.format(number), 'location_name': 'Bank',
+                                     'address': '{} Main St'.format(number)})
+
+
+def _get(client, path='/api/lockers', encoding=None):
+    headers = {'Accept-Encoding': encoding} if encoding else {}
+    return client.get(path, headers=headers)
+
+
+def test_gzip_when_accepted(lockers, client):
+    plain = _get(client)
+    response = _get(client, encoding='gzip')
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert len(response.data) < len(plain.data)
+    assert json.loads(gzip.decompress(response.data)) == plain.get_json()
+
+
+def test_identity_without_accept_encoding(lockers, client):
+    response = _get(client)
+    assert 'Content-Encoding' not in response.headers
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert len(response.get_json()) == 30
+
+
+def test_small_responses_are_not_compressed(lockers, client):
+    client.application.config['COMPRESS_MIN_SIZE'] = 10 ** 6
+    assert 'Content-Encoding' not in _get(client, encoding='gzip').headers
+    client.application.config['COMPRESS_MIN_SIZE'] = 100
+    assert _get(client, encoding='gzip').headers['Content-Encoding'] == 'gzip'
+
+
+def test_compression_can_be_disabled(lockers, client):
+    client.application.config['COMPRESS_ENABLED'] = False
+    assert 'Content-Encoding' not in _get(client, encoding='gzip').headers
+
+
+def test_brotli_only_client_without_brotli_package(lockers, client, monkeypatch):
+    monkeypatch.setattr(compression, 'brotli', None)
+    assert 'Content-Encoding' not in _get(client, encoding='br').headers
+    assert _get(client, encoding='br, gzip').headers['Content-Encoding'] == 'gzip'
+
+
+def test_brotli_preferred_when_available(lockers, client):
+    brotli = pytest.importorskip('brotli')
+    response = _get(client, encoding='gzip, br')
+    assert response.headers['Content-Encoding'] == 'br'
+    assert json.loads(brotli.decompress(response.data)) == _get(client).get_json()
+    # An explicit preference for gzip wins
+    assert _get(client, encoding='gzip;q=1.0, br;q=0.5').headers['Content-Encoding'] == 'gzip'
+
+
+def test_compact_listing_route(repository, client):
+    locker = client.post('/api/lockers', json={'name': 'Home', 'location_name': 'Bedroom',
+                                               'address': '1 Main St'}).get_json()
+    client.post('/api/lockers/{}/assets'.format(locker['id']),
+                json={'name': 'Ring', 'asset_type': 'JEWELLERY', 'material_type': 'Gold'})
+    body = client.get('/api/lockers/{}/assets?format=compact'.format(locker['id'])).get_json()
+    assert set(body) == {'columns', 'rows'}
+    row = dict(zip(body['columns'], body['rows'][0]))
+    assert row['name'] == 'Ring' and row['material_type'] == 'Gold'
+    assert client.get('/api/lockers/{}/assets?format=xml'.format(locker['id'])).status_code == 400
@@ -0,0 +1,102 @@
+"""
+Read replica routing, read-your-writes and lag reporting.
+"""
+import pytest
+
+from backend.database.replicas import ReplicaSet
+from backend.models import repository as repository_module
+from backend.models.repository import SQLiteRepository, set_read_version, set_repository
+from backend.presenters.locker_service import LockerService
+
+
+@pytest.fixture
+def replicated(tmp_path, monkeypatch):
+    """A SQLite primary with two replicas, neither refreshed yet."""
+    path = str(tmp_path / 'locker.db')
+    monkeypatch.setenv('LOCKER_DATABASE_URL', 'sqlite:///' + path)
+    replicas = ReplicaSet([str(tmp_path / 'replica1.db'), str(tmp_path / 'replica2.db')])
+    repo = SQLiteRepository(path, replicas=replicas)
+    repo.init_schema()
+    previous = repository_module._repository
+    set_repository(repo)
+    set_read_version(0)
+    yield repo
+    set_repository(previous)
+    set_read_version(0)
+
+
+def _create_locker(name):
+    return LockerService.create_locker({'name': name, 'location_name': 'Bedroom', 'address': '1 Main St'})
+
+
+def _names(lockers):
+    return sorted(locker['name'] for locker in lockers)
+
+
+def test_reads_use_replicas_that_have_the_callers_writes(replicated):
+    _create_locker('A')
+    replicated.replicas.refresh_all()
+    _create_locker('B')
+
+    # The writer's own context needs version 2, which only the primary has
+    assert _names(LockerService.get_all_lockers()) == ['A', 'B']
+
+    set_read_version(1)
+    assert _names(LockerService.get_all_lockers()) == ['A']
+
+    # Unknown writes: primary only
+    set_read_version(None)
+    assert _names(LockerService.get_all_lockers()) == ['A', 'B']
+
+
+def test_stale_replicas_stop_serving(replicated):
+    _create_locker('A')
+    replicated.replicas.refresh_all()
+    replicated.replicas.max_staleness = 0
+    _create_locker('B')
+    set_read_version(0)
+    assert _names(LockerService.get_all_lockers()) == ['A', 'B']
+
+
+def test_lag_counts_writes_from_processes_without_replicas(replicated):
+    _create_locker('A')
+    replicated.replicas.refresh_all()
+    assert [r['lag_versions'] for r in replicated.replicas.status()['replicas']] == [0, 0]
+
+    # Another process (CLI import, another app node) writes without knowing about replicas
+    set_repository(SQLiteRepository(replicated.path))
+    _create_locker('B')
+    set_repository(replicated)
+    assert [r['lag_versions'] for r in replicated.replicas.status()['replicas']] == [1, 1]
+
+    replicated.replicas.refresh_all()
+    assert [r['lag_versions'] for r in replicated.replicas.status()['replicas']] == [0, 0]
+    set_read_version(0)
+    assert _names(LockerService.get_all_lockers()) == ['A', 'B']
+
+
+def test_version_travels_in_header_and_cookie(replicated, client):
+    address = {'location_name': 'Bedroom', 'address': '1 Main St'}
+    response = client.post('/api/lockers', json=dict(address, name='A'))
+    assert response.headers['X-Locker-Version'] == '1'
+    assert client.get_cookie('locker_version').value == '1'
+    replicated.replicas.refresh_all()
+    client.post('/api/lockers', json=dict(address, name='B'))
+
+    # The cookie carries version 2, so the stale replicas are skipped
+    assert _names(client.get('/api/lockers').get_json()) == ['A', 'B']
+
+    client.delete_cookie('locker_version')
+    assert _names(client.get('/api/lockers', headers={'X-Locker-Version': '1'}).get_json()) == ['A']
+    assert _names(client.get('/api/lockers', headers={'X-Locker-Version': '2'}).get_json()) == ['A', 'B']
+    # A client that sends no version may have written, so it reads the primary
+    assert _names(client.get('/api/lockers').get_json()) == ['A', 'B']
+
+
+def test_replica_status_route(replicated, client):
+    _create_locker('A')
+    replicated.replicas.refresh_all()
+    _create_locker('B')
+    status = client.get('/api/replicas').get_json()
+    assert status['primary_version'] == 2
+    assert [r['lag_versions'] for r in status['replicas']] == [1, 1]
@@ -0,0 +1,59 @@
+"""
+Repository behaviour that is specific to one backend.
+"""
+import pytest
+
+from backend.models.repository import PostgresRepository, SQLiteRepository, create_repository
+
+
+def test_sqlite_url_selects_the_file(tmp_path, monkeypatch):
+    monkeypatch.setenv('LOCKER_READ_REPLICAS', str(tmp_path / 'replica.db'))
+    monkeypatch.setenv('LOCKER_DATABASE_URL', 'sqlite:///' + str(tmp_path / 'configured.db'))
+    configured = create_repository()
+    assert isinstance(configured, SQLiteRepository)
+    assert configured.path == str(tmp_path / 'configured.db')
+    assert configured.replicas is not None
+
+    other = create_repository('sqlite:///' + str(tmp_path / 'other.db'))
+    assert other.path == str(tmp_path / 'other.db')
+    assert other.replicas is None
+
+    with pytest.raises(ValueError):
+        create_repository('mysql://localhost/locker')
+
+
+def test_postgres_pool_drops_dead_connection(postgres_dsn):
+    psycopg2 = pytest.importorskip('psycopg2')
+    repo = PostgresRepository(postgres_dsn)
+    repo.init_schema()
+    with repo.session() as db:
+        first = db.conn
+    admin = psycopg2.connect(postgres_dsn)
+    admin.autocommit = True
+    admin.cursor().execute('SELECT pg_terminate_backend(%s)', (first.get_backend_pid(),))
+    admin.close()
+
+    # rollback() fails on the dead connection; the error from the block still surfaces
+    with pytest.raises(psycopg2.OperationalError):
+        with repo.session() as db:
+            db.fetch_all('SELECT * FROM Locker')
+
+    with repo.session() as db:
+        assert db.conn is not first
+        assert db.fetch_all('SELECT * FROM Locker') == []
+    for conn in repo._pool:
+        conn.close()
+
+
+def test_postgres_placeholders_and_returning(repository):
+    if repository.name != 'postgresql':
+        pytest.skip("PostgreSQL only")
+    with repository.session() as db:
+        new_id = db.insert('''
+            INSERT INTO Locker (name, location_name, address, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?)
+        ''', ('50% share', 'Bank', '1 Main St', '2026-01-01', '2026-01-01'))
+        # A literal % next to ? placeholders, and an untyped parameter in the select list
+        row = db.fetch_one("SELECT id, name, '100%' AS literal, ? AS label FROM Locker WHERE name LIKE ?",
+                           ('tag', '50%'))
+    assert row == {'id': new_id, 'name': '50% share', 'literal': '100%', 'label': 'tag'}
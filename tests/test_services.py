@@ -0,0 +1,95 @@
+"""
+LockerService and AssetService against every storage backend.
+"""
+import pytest
+
+from backend.presenters.asset_service import AssetService
+from backend.presenters.locker_service import LockerService
+
+
+def _create_locker(name='Home safe'):
+    return LockerService.create_locker({'name': name, 'location_name': 'Bedroom', 'address': '1 Main St'})
+
+
+def test_locker_create_update_delete(repository):
+    locker = _create_locker()
+    assert locker['name'] == 'Home safe'
+    assert locker['status'] == 'active'
+
+    updated = LockerService.update_locker(locker['id'], {'name': 'Bank vault'})
+    assert updated['name'] == 'Bank vault'
+    assert updated['address'] == '1 Main St'
+
+    assert [row['id'] for row in LockerService.get_all_lockers()] == [locker['id']]
+    assert LockerService.delete_locker(locker['id'])
+    assert LockerService.get_locker_by_id(locker['id']) is None
+    assert LockerService.get_all_lockers() == []
+
+
+def test_locker_requires_fields(repository):
+    with pytest.raises(ValueError):
+        LockerService.create_locker({'name': 'No address'})
+
+
+def test_update_missing_locker_raises(repository):
+    with pytest.raises(ValueError):
+        LockerService.update_locker(999, {'name': 'x'})
+
+
+def test_asset_create_update_delete(repository):
+    locker = _create_locker()
+    asset = AssetService.create_asset(locker['id'], {
+        'name': 'Ring', 'asset_type': 'JEWELLERY', 'worth_on_creation': 100,
+        'material_type': 'Gold', 'material_grade': '22K',
+    })
+    assert asset['current_value'] == 100
+    assert asset['jewellery_details']['material_type'] == 'Gold'
+
+    updated = AssetService.update_asset(asset['id'], {'asset_type': 'DOCUMENT', 'document_type': 'Deed'})
+    assert updated['asset_type'] == 'DOCUMENT'
+    assert updated['document_details'] == {'document_type': 'Deed'}
+    assert 'jewellery_details' not in updated
+
+    AssetService.create_asset(locker['id'], {'name': 'Watch', 'asset_type': 'MISC'})
+    names = sorted(asset['name'] for asset in AssetService.get_assets_by_locker(locker['id']))
+    assert names == ['Ring', 'Watch']
+
+    assert AssetService.delete_asset(asset['id'])
+    assert AssetService.get_asset_by_id(asset['id']) is None
+    assert [row['name'] for row in AssetService.get_assets_by_locker(locker['id'])] == ['Watch']
+
+
+def test_asset_rejects_unknown_type(repository):
+    locker = _create_locker()
+    with pytest.raises(ValueError):
+        AssetService.create_asset(locker['id'], {'name': 'Car', 'asset_type': 'VEHICLE'})
+
+
+def test_deleting_locker_deletes_its_assets(repository):
+    locker = _create_locker()
+    asset = AssetService.create_asset(locker['id'], {'name': 'Ring', 'asset_type': 'JEWELLERY'})
+    LockerService.delete_locker(locker['id'])
+    assert AssetService.get_asset_by_id(asset['id']) is None
+    assert AssetService.get_assets_by_locker(locker['id']) == []
+
+
+def test_compact_listing_flattens_details(repository):
+    locker = _create_locker()
+    AssetService.create_asset(locker['id'], {
+        'name': 'Ring', 'asset_type': 'JEWELLERY', 'worth_on_creation': 100,
+        'material_type': 'Gold', 'material_grade': '22K', 'gifting_details': 'Wedding',
+    })
+    AssetService.create_asset(locker['id'], {'name': 'Deed', 'asset_type': 'DOCUMENT', 'document_type': 'Title'})
+    AssetService.create_asset(locker['id'], {'name': 'Watch', 'asset_type': 'MISC'})
+
+    compact = AssetService.to_compact(AssetService.get_assets_by_locker(locker['id']))
+    columns = compact['columns']
+    assert 'jewellery_details' not in columns and 'locker_id' not in columns
+    rows = sorted((dict(zip(columns, row)) for row in compact['rows']), key=lambda row: row['name'])
+    assert all(len(row) == len(columns) for row in compact['rows'])
+    assert all(not isinstance(value, dict) for row in rows for value in row.values())
+    deed, ring, watch = rows
+    assert (ring['material_type'], ring['material_grade'], ring['gifting_details']) == ('Gold', '22K', 'Wedding')
+    assert ring['document_type'] is None and ring['worth_on_creation'] == 100
+    assert deed['document_type'] == 'Title' and deed['material_type'] is None
+    assert watch['material_type'] is None and watch['document_type'] is None
@@ -0,0 +1,83 @@
+"""
+Bulk import and export through TransferService and the command line.
+"""
+import io
+import json
+
+from backend.__main__ import main
+from backend.presenters.asset_service import AssetService
+from backend.presenters.locker_service import LockerService
+from backend.presenters.transfer_service import TransferService
+
+
+def _create_locker(name):
+    return LockerService.create_locker({'name': name, 'location_name': 'Bedroom', 'address': '1 Main St'})
+
+
+def _export(entity, fmt='jsonl'):
+    return ''.join(TransferService.export_records(entity, fmt, include_deleted=True))
+
+
+def _import(entity, text, fmt='jsonl', chunk_size=500):
+    return TransferService.import_records(entity, io.StringIO(text), fmt, chunk_size=chunk_size)
+
+
+def test_full_dump_round_trips(sqlite_file, tmp_path):
+    closed = _create_locker('Closed safe')
+    AssetService.create_asset(closed['id'], {'name': 'Old ring', 'asset_type': 'JEWELLERY', 'material_type': 'Gold'})
+    AssetService.create_asset(closed['id'], {'name': 'Old deed', 'asset_type': 'DOCUMENT', 'document_type': 'Deed'})
+    LockerService.delete_locker(closed['id'])
+    home = _create_locker('Home safe')
+    AssetService.create_asset(home['id'], {'name': 'Watch', 'asset_type': 'MISC', 'worth_on_creation': 50})
+    sold = AssetService.create_asset(home['id'], {'name': 'Sold coin', 'asset_type': 'MISC'})
+    AssetService.delete_asset(sold['id'])
+
+    for fmt in ('csv', 'jsonl'):
+        lockers, assets = _export('lockers', fmt), _export('assets', fmt)
+        sqlite_file(tmp_path / 'copy-{}.db'.format(fmt))
+        locker_stats = _import('lockers', lockers, fmt)
+        asset_stats = _import('assets', assets, fmt)
+        assert (locker_stats['rows_inserted'], locker_stats['rows_failed']) == (2, 0)
+        assert (asset_stats['rows_inserted'], asset_stats['rows_failed']) == (4, 0)
+        assert _export('lockers', fmt) == lockers
+        assert [json.loads(line)['name'] for line in _export('assets').splitlines()] == \
+            ['Old ring', 'Old deed', 'Watch', 'Sold coin']
+        assert [asset['name'] for asset in AssetService.get_assets_by_locker(home['id'])] == ['Watch']
+
+
+def test_asset_rows_need_a_matching_locker(sqlite_file):
+    home = _create_locker('Home safe')
+    closed = _create_locker('Closed safe')
+    LockerService.delete_locker(closed['id'])
+    rows = [
+        {'name': 'Ring', 'asset_type': 'MISC', 'locker_id': home['id']},
+        {'name': 'Lost', 'asset_type': 'MISC', 'locker_id': 999},
+        {'name': 'Active in closed', 'asset_type': 'MISC', 'locker_id': closed['id']},
+        {'name': 'Deleted in closed', 'asset_type': 'MISC', 'locker_id': closed['id'], 'status': 'deleted'},
+    ]
+    stats = _import('assets', ''.join(json.dumps(row) + '\n' for row in rows))
+    assert stats['rows_inserted'] == 2
+    assert stats['errors'] == [{'row': 2, 'error': 'Locker not found'},
+                               {'row': 3, 'error': 'Locker is deleted'}]
+
+
+def test_rejects_non_integer_ids(sqlite_file):
+    home = _create_locker('Home safe')
+    lines = ['{"name": "A", "asset_type": "MISC", "locker_id": %s}\n' % value
+             for value in ('1.7', 'true', '"1.0"', str(home['id']))]
+    stats = _import('assets', ''.join(lines))
+    assert stats['rows_inserted'] == 1
+    assert [error['row'] for error in stats['errors']] == [1, 2, 3]
+
+
+def test_bad_rows_do_not_stop_the_import(sqlite_file):
+    text = 'name,location_name,address\nA,B,C\n,,\nD,E,F\n'
+    stats = _import('lockers', text, fmt='csv', chunk_size=1)
+    assert (stats['rows_read'], stats['rows_inserted'], stats['rows_failed']) == (3, 2, 1)
+
+
+def test_cli_import_prints_only_json(sqlite_file, tmp_path, capsys):
+    path = tmp_path / 'lockers.csv'
+    path.write_text('name,location_name,address\nA,B,C\n')
+    assert main(['import', 'lockers', str(path)]) == 0
+    assert json.loads(capsys.readouterr().out)['rows_inserted'] == 1
@@ -0,0 +1,81 @@
+"""
+Valuation history, worth corrections, bulk revaluation and rollups.
+"""
+import io
+
+import pytest
+
+from backend.database.db_setup import get_timestamp
+from backend.presenters.asset_service import AssetService
+from backend.presenters.locker_service import LockerService
+from backend.presenters.transfer_service import TransferService
+from backend.presenters.valuation_service import ValuationService
+
+
+def _create_locker():
+    return LockerService.create_locker({'name': 'Home safe', 'location_name': 'Bedroom', 'address': '1 Main St'})
+
+
+def _create_ring(locker, worth=100, grade='22K'):
+    return AssetService.create_asset(locker['id'], {
+        'name': 'Ring', 'asset_type': 'JEWELLERY', 'worth_on_creation': worth,
+        'material_type': 'Gold', 'material_grade': grade,
+    })
+
+
+def _today_total(locker):
+    today = get_timestamp()[:10]
+    points = ValuationService.get_locker_valuation(locker['id'], today, today)['points']
+    return points[-1]['total_value'] if points else None
+
+
+def test_worth_correction_follows_until_revalued(repository):
+    locker = _create_locker()
+    ring = _create_ring(locker)
+
+    assert AssetService.update_asset(ring['id'], {'worth_on_creation': 120})['current_value'] == 120
+    assert _today_total(locker) == 120
+    assert [entry['source'] for entry in ValuationService.get_asset_history(ring['id'])] == ['creation']
+
+    ValuationService.record_valuation(ring['id'], {'value': 150})
+    updated = AssetService.update_asset(ring['id'], {'worth_on_creation': 130})
+    assert (updated['worth_on_creation'], updated['current_value']) == (130, 150)
+    assert _today_total(locker) == 150
+
+
+def test_worth_correction_of_imported_asset(sqlite_file):
+    locker = _create_locker()
+    line = '{"name": "Ring", "asset_type": "MISC", "locker_id": %d, "worth_on_creation": 100}\n' % locker['id']
+    TransferService.import_records('assets', io.StringIO(line), 'jsonl')
+    asset = AssetService.get_assets_by_locker(locker['id'])[0]
+
+    assert AssetService.update_asset(asset['id'], {'worth_on_creation': 80})['current_value'] == 80
+    assert _today_total(locker) == 80
+
+
+def test_bulk_revalue_by_filter(repository):
+    locker = _create_locker()
+    other = _create_locker()
+    first = _create_ring(locker, 100, '22K')
+    _create_ring(locker, 100, '18K')
+    _create_ring(other, 200, '22K')
+
+    result = ValuationService.bulk_revalue({'material_type': 'Gold', 'material_grade': '22K',
+                                            'locker_id': locker['id'], 'multiplier': 1.5})
+    assert result == {'assets_revalued': 1}
+    assert AssetService.get_asset_by_id(first['id'])['current_value'] == 150
+    assert _today_total(locker) == 250
+    assert _today_total(other) == 200
+    assert ValuationService.get_asset_history(first['id'])[0]['source'] == 'revaluation'
+
+    assert ValuationService.bulk_revalue({'org_id': '1', 'value': 10})['assets_revalued'] == 3
+
+
+@pytest.mark.parametrize('field, value', [
+    ('org_id', '1 OR 1=1'), ('org_id', 1.5), ('locker_id', True), ('locker_id', [1]), ('locker_id', '-1'),
+])
+def test_bulk_revalue_rejects_non_integer_ids(repository, client, field, value):
+    with pytest.raises(ValueError):
+        ValuationService.bulk_revalue({field: value, 'multiplier': 2})
+    response = client.post('/api/valuations/revalue', json={field: value, 'multiplier': 2})
+    assert response.status_code == 400